@@ -0,0 +1,183 @@
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# The shared access layer lives with the pipeline scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from utils import setup_logging  # noqa: E402
+from review_schema import load_reviews  # noqa: E402
+import db_sqlite  # noqa: E402
+import db_upload  # noqa: E402
+from db_access import close_pool, get_connection  # noqa: E402
+
+logger = setup_logging(__name__)
+
+# --- CONFIGURATION ---
+INPUT_FILE = Path("data/processed/sentiment_results.csv")
+BENCH_SQLITE_PATH = Path("data/processed/bench_reviews.db")
+# Throwaway schema for the Postgres run. queries.sql uses unqualified
+# table names, so the benchmark points search_path here instead of at the
+# production tables.
+BENCH_SCHEMA = "bench_backends"
+DEFAULT_COPIES = 1  # times the sample is replicated for the load
+QUERY_REPEATS = 50
+
+# Same layout as schema.sql, created only inside BENCH_SCHEMA
+BENCH_DDL = """
+    CREATE TABLE banks (
+        bank_id SERIAL PRIMARY KEY,
+        bank_name VARCHAR(50) UNIQUE NOT NULL,
+        app_name VARCHAR(100)
+    );
+    CREATE TABLE reviews (
+        review_id SERIAL,
+        bank_id INTEGER REFERENCES banks(bank_id),
+        review_text TEXT,
+        rating INTEGER,
+        review_date TIMESTAMP NOT NULL,
+        sentiment_label VARCHAR(20),
+        sentiment_score FLOAT,
+        app_version VARCHAR(50),
+        source VARCHAR(50) DEFAULT 'Google Play',
+        PRIMARY KEY (review_id, review_date)
+    ) PARTITION BY RANGE (review_date);
+    CREATE INDEX ON reviews(bank_id);
+    CREATE INDEX ON reviews USING BRIN (review_date);
+    CREATE INDEX ON reviews(bank_id, app_version);
+    CREATE MATERIALIZED VIEW app_version_rollup AS
+    SELECT
+        r.bank_id,
+        COALESCE(r.app_version, 'unknown') AS app_version,
+        COUNT(*) AS review_count,
+        AVG(r.rating) AS mean_rating,
+        AVG(r.sentiment_score) AS mean_sentiment,
+        COUNT(*) FILTER (WHERE r.rating = 1) AS rating_1,
+        COUNT(*) FILTER (WHERE r.rating = 2) AS rating_2,
+        COUNT(*) FILTER (WHERE r.rating = 3) AS rating_3,
+        COUNT(*) FILTER (WHERE r.rating = 4) AS rating_4,
+        COUNT(*) FILTER (WHERE r.rating = 5) AS rating_5
+    FROM reviews r
+    GROUP BY r.bank_id, COALESCE(r.app_version, 'unknown');
+"""
+
+
+def load_sample(copies: int) -> pd.DataFrame:
+    df = load_reviews(INPUT_FILE)
+    return pd.concat([df] * copies, ignore_index=True)
+
+
+def time_queries(execute) -> list:
+    """Runs every queries.sql statement QUERY_REPEATS times via `execute`."""
+    with open(db_sqlite.QUERIES_FILE, "r") as f:
+        statements = db_sqlite.split_statements(f.read())
+
+    timings = []
+    for i, statement in enumerate(statements, 1):
+        start = time.perf_counter()
+        for _ in range(QUERY_REPEATS):
+            execute(statement)
+        elapsed = time.perf_counter() - start
+        timings.append(
+            {
+                "query": i,
+                "ms_per_query": round(elapsed / QUERY_REPEATS * 1000, 3),
+                "queries_per_s": round(QUERY_REPEATS / elapsed, 1),
+            }
+        )
+    return timings
+
+
+def bench_sqlite(df: pd.DataFrame) -> tuple:
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{BENCH_SQLITE_PATH}{suffix}").unlink(missing_ok=True)
+
+    with db_sqlite.get_connection(BENCH_SQLITE_PATH) as conn:
+        if not db_sqlite.setup_database(conn):
+            raise RuntimeError("schema setup failed (see log)")
+        start = time.perf_counter()
+        if not db_sqlite.upload_data(conn, df):
+            raise RuntimeError("load failed (see log)")
+        load_s = time.perf_counter() - start
+
+        queries = time_queries(lambda sql: conn.execute(sql).fetchall())
+
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{BENCH_SQLITE_PATH}{suffix}").unlink(missing_ok=True)
+    return load_s, queries
+
+
+def bench_postgres(df: pd.DataFrame) -> tuple:
+    with get_connection() as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE;")
+            cur.execute(f"CREATE SCHEMA {BENCH_SCHEMA};")
+            cur.execute(f"SET search_path TO {BENCH_SCHEMA};")
+            cur.execute(BENCH_DDL)
+            conn.commit()
+
+            start = time.perf_counter()
+            if not db_upload.upload_data(conn, df):
+                raise RuntimeError("load failed (see log)")
+            load_s = time.perf_counter() - start
+
+            def execute(sql):
+                cur.execute(sql)
+                cur.fetchall()
+
+            queries = time_queries(execute)
+        finally:
+            conn.rollback()
+            cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE;")
+            # Pooled connection: don't hand it back pointing at the bench
+            cur.execute("RESET search_path;")
+            conn.commit()
+            cur.close()
+    return load_s, queries
+
+
+def main():
+    """Usage: benchmark_backends.py [copies of the sample to load]"""
+    if not INPUT_FILE.exists():
+        logger.error(f"Input file not found: {INPUT_FILE}")
+        return
+
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COPIES
+    df = load_sample(copies)
+
+    loads, queries = [], []
+    for backend, bench in [("sqlite", bench_sqlite), ("postgres", bench_postgres)]:
+        try:
+            load_s, timings = bench(df)
+        except Exception as e:
+            logger.error(f"{backend} benchmark skipped: {e}")
+            continue
+        finally:
+            if backend == "postgres":
+                close_pool()
+        loads.append(
+            {
+                "backend": backend,
+                "rows": len(df),
+                "load_s": round(load_s, 2),
+                "rows_per_s": round(len(df) / load_s),
+            }
+        )
+        queries.extend({"backend": backend, **t} for t in timings)
+
+    print(f"\n--- Load Throughput ({len(df)} reviews) ---")
+    print(pd.DataFrame(loads).to_string(index=False))
+    print(f"\n--- queries.sql Throughput ({QUERY_REPEATS} runs each) ---")
+    print(
+        pd.DataFrame(queries)
+        .pivot(index="query", columns="backend", values="ms_per_query")
+        .add_suffix(" ms")
+        .to_string()
+    )
+
+
+if __name__ == "__main__":
+    main()
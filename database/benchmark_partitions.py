@@ -0,0 +1,138 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# The shared access layer lives with the pipeline scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from utils import setup_logging  # noqa: E402
+from db_access import close_pool, get_connection  # noqa: E402
+
+logger = setup_logging(__name__)
+
+# --- CONFIGURATION ---
+DEFAULT_ROWS = 5_000_000
+HISTORY_START = pd.Period("2023-01", freq="M")
+HISTORY_MONTHS = 36
+QUERY_MONTH = pd.Period("2025-06", freq="M")
+
+HEAP_TABLE = "bench_reviews_heap"
+PART_TABLE = "bench_reviews_part"
+
+COLUMNS = """
+    review_id BIGSERIAL,
+    bank_id INTEGER,
+    rating INTEGER,
+    review_date TIMESTAMP NOT NULL,
+    sentiment_score FLOAT
+"""
+
+QUERY = """
+    SELECT bank_id, COUNT(*), AVG(sentiment_score)
+    FROM {table}
+    WHERE review_date >= %(lower)s AND review_date < %(upper)s
+    GROUP BY bank_id;
+"""
+
+
+def create_tables(cur) -> None:
+    """Creates an unpartitioned B-tree baseline and the partitioned layout."""
+    cur.execute(f"DROP TABLE IF EXISTS {HEAP_TABLE}, {PART_TABLE} CASCADE;")
+
+    cur.execute(f"CREATE TABLE {HEAP_TABLE} ({COLUMNS});")
+    cur.execute(f"CREATE INDEX ON {HEAP_TABLE}(review_date);")
+
+    cur.execute(
+        f"CREATE TABLE {PART_TABLE} ({COLUMNS}) PARTITION BY RANGE (review_date);"
+    )
+    for offset in range(HISTORY_MONTHS):
+        month = HISTORY_START + offset
+        cur.execute(
+            f"CREATE TABLE {PART_TABLE}_{month.year}_{month.month:02d} "
+            f"PARTITION OF {PART_TABLE} FOR VALUES FROM "
+            f"('{month.start_time:%Y-%m-%d}') TO ('{(month + 1).start_time:%Y-%m-%d}');"
+        )
+    cur.execute(f"CREATE INDEX ON {PART_TABLE} USING BRIN (review_date);")
+
+
+def load_rows(cur, rows: int) -> None:
+    """Generates date-ordered synthetic reviews server-side into both tables."""
+    span_days = (HISTORY_START + HISTORY_MONTHS).start_time - HISTORY_START.start_time
+    for table in (HEAP_TABLE, PART_TABLE):
+        start = time.perf_counter()
+        cur.execute(
+            f"""
+            INSERT INTO {table} (bank_id, rating, review_date, sentiment_score)
+            SELECT 1 + (g % 3),
+                   1 + (g % 5),
+                   %(start)s::timestamp
+                       + (g::float / %(rows)s) * %(span)s * INTERVAL '1 day',
+                   random() * 2 - 1
+            FROM generate_series(0, %(rows)s - 1) AS g;
+            """,
+            {
+                "start": HISTORY_START.start_time.to_pydatetime(),
+                "rows": rows,
+                "span": span_days.days,
+            },
+        )
+        cur.execute(f"ANALYZE {table};")
+        logger.info(
+            f"Loaded {rows} rows into {table} in {time.perf_counter() - start:.1f}s"
+        )
+
+
+def explain(cur, table: str) -> dict:
+    """Runs the date-filtered query under EXPLAIN ANALYZE and summarizes it."""
+    params = {
+        "lower": QUERY_MONTH.start_time.to_pydatetime(),
+        "upper": (QUERY_MONTH + 1).start_time.to_pydatetime(),
+    }
+    cur.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + QUERY.format(table=table), params)
+    raw = cur.fetchone()[0]
+    plan = (raw if isinstance(raw, list) else json.loads(raw))[0]
+
+    relations = set()
+
+    def walk(node):
+        if "Relation Name" in node:
+            relations.add(node["Relation Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan["Plan"])
+    return {
+        "table": table,
+        "relations_scanned": len(relations),
+        "execution_ms": round(plan["Execution Time"], 2),
+    }
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            create_tables(cur)
+            load_rows(cur, rows)
+            conn.commit()
+
+            results = pd.DataFrame([explain(cur, t) for t in (HEAP_TABLE, PART_TABLE)])
+            print(f"\n--- Date-Filtered Query ({QUERY_MONTH}, {rows} rows) ---")
+            print(results.to_string(index=False))
+
+            cur.execute(f"DROP TABLE IF EXISTS {HEAP_TABLE}, {PART_TABLE} CASCADE;")
+            conn.commit()
+            cur.close()
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 -- Queries for Analysis
+-- Portable SQL: runs unchanged on PostgreSQL and on the SQLite backend
+-- (DB_BACKEND=sqlite, see scripts/db_sqlite.py).
 
 -- 1. Average Sentiment Score per Bank
 SELECT 
@@ -26,3 +28,16 @@ JOIN banks b ON r.bank_id = b.bank_id
 WHERE b.bank_name = 'CBE' AND r.sentiment_label = 'Negative'
 ORDER BY r.sentiment_score ASC
 LIMIT 10;
+
+-- 4. Release comparison for a bank (e.g., CBE 5.2.1 vs 5.2.0)
+SELECT
+    v.app_version,
+    v.review_count,
+    v.mean_rating,
+    v.mean_sentiment,
+    v.rating_1,
+    v.rating_5
+FROM app_version_rollup v
+JOIN banks b ON v.bank_id = b.bank_id
+WHERE b.bank_name = 'CBE' AND v.app_version IN ('5.2.1', '5.2.0')
+ORDER BY v.app_version DESC;
@@ -1,26 +1,55 @@
--- Drop tables if they exist to ensure clean state
-DROP TABLE IF EXISTS reviews;
-DROP TABLE IF EXISTS banks;
+-- Idempotent: run before every load. Existing tables, their monthly
+-- partitions and the data in them are kept (db_upload.py replaces the
+-- months it loads and drops expired partitions for retention).
 
 -- Create Banks Table
-CREATE TABLE banks (
+CREATE TABLE IF NOT EXISTS banks (
     bank_id SERIAL PRIMARY KEY,
     bank_name VARCHAR(50) UNIQUE NOT NULL,
     app_name VARCHAR(100)
 );
 
 -- Create Reviews Table
-CREATE TABLE reviews (
-    review_id SERIAL PRIMARY KEY,
+-- Range-partitioned by month of review_date. Monthly partitions
+-- (reviews_YYYY_MM, optionally sub-partitioned by bank_id) are created
+-- on demand by db_upload.py and dropped whole for retention.
+-- A reviews table from the old unpartitioned schema must be dropped once
+-- by hand before the first load.
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id SERIAL,
     bank_id INTEGER REFERENCES banks(bank_id),
     review_text TEXT,
     rating INTEGER,
-    review_date TIMESTAMP,
+    review_date TIMESTAMP NOT NULL,
     sentiment_label VARCHAR(20),
     sentiment_score FLOAT,
-    source VARCHAR(50) DEFAULT 'Google Play'
-);
+    app_version VARCHAR(50),
+    source VARCHAR(50) DEFAULT 'Google Play',
+    PRIMARY KEY (review_id, review_date)
+) PARTITION BY RANGE (review_date);
+
+-- Indexes for performance (propagated to every partition)
+CREATE INDEX IF NOT EXISTS idx_reviews_bank_id ON reviews(bank_id);
+-- Reviews arrive roughly in date order, so a BRIN index stays tiny
+-- while still letting range scans skip most blocks of a partition.
+CREATE INDEX IF NOT EXISTS idx_reviews_date_brin ON reviews USING BRIN (review_date);
+CREATE INDEX IF NOT EXISTS idx_reviews_bank_version ON reviews(bank_id, app_version);
+
+-- Per-bank, per-app-version cohort rollup for release-regression analysis.
+-- Refreshed by db_upload.py after each load.
+CREATE MATERIALIZED VIEW IF NOT EXISTS app_version_rollup AS
+SELECT
+    r.bank_id,
+    COALESCE(r.app_version, 'unknown') AS app_version,
+    COUNT(*) AS review_count,
+    AVG(r.rating) AS mean_rating,
+    AVG(r.sentiment_score) AS mean_sentiment,
+    COUNT(*) FILTER (WHERE r.rating = 1) AS rating_1,
+    COUNT(*) FILTER (WHERE r.rating = 2) AS rating_2,
+    COUNT(*) FILTER (WHERE r.rating = 3) AS rating_3,
+    COUNT(*) FILTER (WHERE r.rating = 4) AS rating_4,
+    COUNT(*) FILTER (WHERE r.rating = 5) AS rating_5
+FROM reviews r
+GROUP BY r.bank_id, COALESCE(r.app_version, 'unknown');
 
--- Indexes for performance
-CREATE INDEX idx_reviews_bank_id ON reviews(bank_id);
-CREATE INDEX idx_reviews_date ON reviews(review_date);
\ No newline at end of file
+CREATE UNIQUE INDEX IF NOT EXISTS idx_app_version_rollup ON app_version_rollup(bank_id, app_version);
@@ -0,0 +1,42 @@
+-- SQLite variant of schema.sql (DB_BACKEND=sqlite).
+-- Same banks/reviews layout; SQLite has no partitioning or materialized
+-- views, so app_version_rollup is a plain table rebuilt by db_upload.py.
+-- Idempotent like schema.sql: existing data is kept, and db_upload.py
+-- replaces the months it loads.
+
+-- Create Banks Table
+CREATE TABLE IF NOT EXISTS banks (
+    bank_id INTEGER PRIMARY KEY,
+    bank_name VARCHAR(50) UNIQUE NOT NULL,
+    app_name VARCHAR(100)
+);
+
+-- Create Reviews Table
+-- review_date is stored as ISO-8601 text ('YYYY-MM-DD HH:MM:SS'), which
+-- sorts and compares correctly as a string.
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id INTEGER PRIMARY KEY,
+    bank_id INTEGER REFERENCES banks(bank_id),
+    review_text TEXT,
+    rating INTEGER,
+    review_date TIMESTAMP NOT NULL,
+    sentiment_label VARCHAR(20),
+    sentiment_score FLOAT,
+    app_version VARCHAR(50),
+    source VARCHAR(50) DEFAULT 'Google Play'
+);
+
+-- Per-bank, per-app-version cohort rollup (see schema.sql)
+CREATE TABLE IF NOT EXISTS app_version_rollup (
+    bank_id INTEGER,
+    app_version VARCHAR(50),
+    review_count INTEGER,
+    mean_rating FLOAT,
+    mean_sentiment FLOAT,
+    rating_1 INTEGER,
+    rating_2 INTEGER,
+    rating_3 INTEGER,
+    rating_4 INTEGER,
+    rating_5 INTEGER,
+    PRIMARY KEY (bank_id, app_version)
+);
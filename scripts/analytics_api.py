@@ -0,0 +1,285 @@
+import asyncio
+import hashlib
+import json
+import os
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from utils import setup_logging
+from review_schema import load_reviews
+from keyword_thematic import get_top_n_grams
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+INPUT_FILE = Path("data/processed/sentiment_results.csv")
+HOST = os.getenv("API_HOST", "127.0.0.1")
+PORT = int(os.getenv("API_PORT", "8080"))
+
+RELOAD_INTERVAL_SECONDS = 5.0
+TOP_KEYWORDS = 10
+TOP_BIGRAMS = 5
+MAX_SAMPLE_SIZE = 100
+MAX_CACHED_RESPONSES = 1024
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+def _score(value) -> Optional[float]:
+    """Rounded sentiment score, or None (JSON null) for unscored rows."""
+    return None if pd.isna(value) else round(float(value), 4)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match check (RFC 9110 weak comparison): the header may list
+    several tags, each possibly marked weak with W/, or be "*".
+    """
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class AnalyticsSnapshot:
+    """
+    Precomputed view of one version of the processed results. Response
+    bodies are cached per request target together with their ETag.
+    """
+
+    def __init__(self, df: pd.DataFrame, mtime: float):
+        self.mtime = mtime
+        self.df = df
+        self.banks = sorted(df["bank_name"].astype(str).unique())
+        self.metrics = {bank: self._bank_metrics(bank) for bank in self.banks}
+        self.trends = {bank: self._bank_trend(bank) for bank in self.banks}
+        self.keywords = {bank: self._bank_keywords(bank) for bank in self.banks}
+        self._cache: Dict[str, Tuple[str, bytes]] = {}
+
+    @classmethod
+    def load(cls, file_path: Path) -> "AnalyticsSnapshot":
+        mtime = file_path.stat().st_mtime
+        return cls(load_reviews(file_path), mtime)
+
+    def _bank_df(self, bank: str) -> pd.DataFrame:
+        return self.df[self.df["bank_name"] == bank]
+
+    def _bank_metrics(self, bank: str) -> Dict[str, Any]:
+        bank_df = self._bank_df(bank)
+        ratings = bank_df["rating"].value_counts().sort_index()
+        labels = bank_df["sentiment_label"].value_counts()
+        return {
+            "bank_name": bank,
+            "review_count": int(len(bank_df)),
+            "average_sentiment": _score(bank_df["sentiment_score"].mean()),
+            "average_rating": round(float(bank_df["rating"].mean()), 4),
+            "rating_distribution": {str(k): int(v) for k, v in ratings.items()},
+            "sentiment_distribution": {str(k): int(v) for k, v in labels.items()},
+        }
+
+    def _bank_trend(self, bank: str) -> Dict[str, Any]:
+        bank_df = self._bank_df(bank)
+        monthly = bank_df.groupby(bank_df["review_date"].dt.to_period("M"))[
+            "sentiment_score"
+        ].agg(["mean", "size"])
+        return {
+            "bank_name": bank,
+            "window": "monthly",
+            "points": [
+                {
+                    "period": str(period),
+                    "average_sentiment": _score(row["mean"]),
+                    "review_count": int(row["size"]),
+                }
+                for period, row in monthly.iterrows()
+            ],
+        }
+
+    def _bank_keywords(self, bank: str) -> Dict[str, Any]:
+        bank_df = self._bank_df(bank)
+        corpus = bank_df["processed_text"].dropna().tolist()
+        negative = (
+            bank_df[bank_df["sentiment_label"] == "Negative"]["processed_text"]
+            .dropna()
+            .tolist()
+        )
+
+        def as_list(pairs):
+            return [{"term": term, "count": int(count)} for term, count in pairs]
+
+        return {
+            "bank_name": bank,
+            "keywords": as_list(get_top_n_grams(corpus, n=1, top_k=TOP_KEYWORDS)),
+            "themes": as_list(get_top_n_grams(corpus, n=2, top_k=TOP_BIGRAMS)),
+            "pain_points": as_list(get_top_n_grams(negative, n=2, top_k=TOP_BIGRAMS)),
+        }
+
+    def _bank_reviews(self, bank: str, query: Dict[str, list]) -> Dict[str, Any]:
+        bank_df = self._bank_df(bank)
+        label = query.get("label", [None])[0]
+        if label:
+            bank_df = bank_df[bank_df["sentiment_label"] == label]
+        limit = query.get("limit", ["10"])[0]
+        limit = min(int(limit) if limit.isdigit() else 10, MAX_SAMPLE_SIZE)
+        sample = bank_df.sort_values("review_date", ascending=False).head(limit)
+        return {
+            "bank_name": bank,
+            "reviews": [
+                {
+                    "review_date": row["review_date"].isoformat(),
+                    "rating": int(row["rating"]),
+                    "sentiment_label": str(row["sentiment_label"]),
+                    "sentiment_score": _score(row["sentiment_score"]),
+                    "text": row["cleaned_text"],
+                }
+                for _, row in sample.iterrows()
+            ],
+        }
+
+    def route(self, path: str, query: Dict[str, list]) -> Optional[Any]:
+        """Resolves a request path to a JSON-serializable payload."""
+        parts = [unquote(p) for p in path.strip("/").split("/") if p]
+        if parts == ["banks"]:
+            return {"banks": [self.metrics[bank] for bank in self.banks]}
+        if len(parts) >= 2 and parts[0] == "banks" and parts[1] in self.metrics:
+            bank = parts[1]
+            if len(parts) == 2:
+                return self.metrics[bank]
+            if parts[2:] == ["trend"]:
+                return self.trends[bank]
+            if parts[2:] == ["keywords"]:
+                return self.keywords[bank]
+            if parts[2:] == ["reviews"]:
+                return self._bank_reviews(bank, query)
+        return None
+
+    def response(self, target: str) -> Optional[Tuple[str, bytes]]:
+        """Returns the cached (etag, body) for a request target."""
+        if target not in self._cache:
+            url = urlsplit(target)
+            payload = self.route(url.path, parse_qs(url.query))
+            if payload is None:
+                return None
+            body = json.dumps(payload).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+            if len(self._cache) >= MAX_CACHED_RESPONSES:
+                return etag, body
+            self._cache[target] = (etag, body)
+        return self._cache[target]
+
+
+class AnalyticsServer:
+    """Read-only HTTP/1.1 JSON server over the current snapshot."""
+
+    def __init__(self, file_path: Path = INPUT_FILE):
+        self.file_path = file_path
+        self.snapshot = AnalyticsSnapshot.load(file_path)
+
+    async def watch(self) -> None:
+        """Reloads the snapshot in the background when the artifact changes."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(RELOAD_INTERVAL_SECONDS)
+            try:
+                mtime = self.file_path.stat().st_mtime
+                if mtime == self.snapshot.mtime:
+                    continue
+                snapshot = await loop.run_in_executor(
+                    None, AnalyticsSnapshot.load, self.file_path
+                )
+                self.snapshot = snapshot
+                logger.info(f"Reloaded {self.file_path} ({len(snapshot.df)} rows)")
+            except Exception as e:
+                logger.error(f"Reload failed, keeping previous snapshot: {e}")
+
+    async def handle(self, reader, writer) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                try:
+                    status, body, etag = self.dispatch(method, target, headers)
+                except Exception as e:
+                    # A failing route must not drop the client's connection
+                    logger.error(f"Request failed: {method} {target}: {e}")
+                    status, body, etag = 500, b'{"error": "internal error"}', None
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                head = [
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(body)}",
+                    "Cache-Control: no-cache",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                ]
+                if etag:
+                    head.append(f"ETag: {etag}")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def dispatch(
+        self, method: str, target: str, headers: Dict[str, str]
+    ) -> Tuple[int, bytes, Optional[str]]:
+        if method != "GET":
+            return 405, b'{"error": "method not allowed"}', None
+
+        cached = self.snapshot.response(target)
+        if cached is None:
+            return 404, b'{"error": "not found"}', None
+
+        etag, body = cached
+        if etag_matches(headers.get("if-none-match", ""), etag):
+            return 304, b"", etag
+        return 200, body, etag
+
+    async def serve(self, host: str = HOST, port: int = PORT) -> None:
+        server = await asyncio.start_server(self.handle, host, port)
+        logger.info(f"Analytics API listening on http://{host}:{port}")
+        watcher = asyncio.create_task(self.watch())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def main():
+    if not INPUT_FILE.exists():
+        logger.error(
+            f"Input file not found: {INPUT_FILE}. Run sentiment_analysis.py first."
+        )
+        return
+
+    try:
+        asyncio.run(AnalyticsServer(INPUT_FILE).serve())
+    except KeyboardInterrupt:
+        logger.info("Analytics API stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import asyncio
+import sys
+import time
+import numpy as np
+from typing import List, Optional
+
+from utils import setup_logging
+from analytics_api import HOST, PORT
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+TOTAL_REQUESTS = 5000
+CONCURRENCY = 20
+TARGETS = [
+    "/banks",
+    "/banks/CBE",
+    "/banks/BOA/trend",
+    "/banks/Dashen/keywords",
+    "/banks/CBE/reviews?label=Negative&limit=10",
+]
+
+
+async def _request(reader, writer, target: str, etag: Optional[str]):
+    """Sends one keep-alive GET and returns (status, etag)."""
+    lines = [f"GET {target} HTTP/1.1", f"Host: {HOST}"]
+    if etag:
+        lines.append(f"If-None-Match: {etag}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("etag")
+
+
+async def _worker(
+    worker_id: int, count: int, use_etags: bool, latencies: List[float]
+) -> None:
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+    etags = {}
+    try:
+        for i in range(count):
+            target = TARGETS[(worker_id + i) % len(TARGETS)]
+            start = time.perf_counter()
+            status, etag = await _request(
+                reader, writer, target, etags.get(target) if use_etags else None
+            )
+            latencies.append(time.perf_counter() - start)
+            if status == 200 and etag:
+                etags[target] = etag
+    finally:
+        writer.close()
+
+
+async def run_load_test(
+    total: int = TOTAL_REQUESTS, concurrency: int = CONCURRENCY, use_etags=False
+) -> List[float]:
+    latencies: List[float] = []
+    per_worker = max(total // concurrency, 1)
+    await asyncio.gather(
+        *(_worker(w, per_worker, use_etags, latencies) for w in range(concurrency))
+    )
+    return latencies
+
+
+def report(name: str, latencies: List[float], elapsed: float) -> None:
+    ms = np.array(latencies) * 1000
+    print(
+        f"{name:<18} requests={len(ms):>6}  rps={len(ms) / elapsed:>8.0f}  "
+        f"p50={np.percentile(ms, 50):.2f}ms  p99={np.percentile(ms, 99):.2f}ms"
+    )
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else TOTAL_REQUESTS
+
+    print(f"\n--- Analytics API Load Test (http://{HOST}:{PORT}) ---")
+    for name, use_etags in [("full responses", False), ("if-none-match", True)]:
+        try:
+            start = time.perf_counter()
+            latencies = asyncio.run(run_load_test(total, CONCURRENCY, use_etags))
+            report(name, latencies, time.perf_counter() - start)
+        except OSError as e:
+            logger.error(f"Could not reach the API. Is analytics_api.py running? ({e})")
+            return
+
+
+if __name__ == "__main__":
+    main()
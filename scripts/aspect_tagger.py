@@ -0,0 +1,216 @@
+import json
+import os
+import re
+import sys
+import time
+import numpy as np
+import pandas as pd
+from collections import deque
+from pathlib import Path
+from typing import Dict, List
+
+from utils import setup_logging
+from review_schema import load_reviews
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+INPUT_FILE = Path("data/processed/sentiment_results.csv")
+TAGS_FILE = Path("data/processed/review_aspects.csv")
+TABLE_FILE = Path("reports/insights/aspect_sentiment.csv")
+
+# Optional JSON file {"aspect": ["synonym", ...]} replacing the defaults
+DICTIONARY_FILE = os.getenv("ASPECT_DICTIONARY")
+
+# Synonyms match whole words; a trailing "*" also matches any word that
+# starts with it (e.g. "crash*" -> crash, crashes, crashing).
+DEFAULT_ASPECTS: Dict[str, List[str]] = {
+    "login": ["login", "log in", "sign in", "signin", "password", "pin"],
+    "otp": ["otp", "verification code", "verification key", "activation code"],
+    "transfer": ["transfer*", "send money", "transaction*", "payment*"],
+    "crash": ["crash*", "crush*", "freez*", "stuck", "keeps closing"],
+    "update": ["update*", "new version", "latest version", "upgrade*"],
+    "network": ["network", "connection", "internet", "offline", "sync*"],
+    "fees": ["fee", "fees", "charge*", "commission", "service charge"],
+}
+
+# Anything that is not a letter or digit acts as a word boundary
+NON_WORD = re.compile(r"[^\w]+|_")
+
+
+def load_aspects(path=DICTIONARY_FILE) -> Dict[str, List[str]]:
+    """The aspect -> synonym dictionary (from `path` if given)."""
+    if not path:
+        return DEFAULT_ASPECTS
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercases and pads with boundaries so ' word ' marks whole words."""
+    return f" {NON_WORD.sub(' ', text.lower()).strip()} "
+
+
+class AspectAutomaton:
+    """
+    Aho-Corasick automaton over every synonym of every aspect. Each state
+    carries the OR of the aspect bits of all patterns ending there (its
+    own and those reached through failure links), so one left-to-right
+    pass over a text yields its full aspect bitmask, independent of how
+    many synonyms are configured.
+    """
+
+    def __init__(self, aspects: Dict[str, List[str]]):
+        if len(aspects) > 64:
+            raise ValueError("At most 64 aspects fit in the bitmask.")
+        self.aspects = list(aspects)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[int] = [0]
+
+        for bit, synonyms in enumerate(aspects.values()):
+            for synonym in synonyms:
+                self._add(self._pattern(synonym), 1 << bit)
+        self._link()
+
+    @staticmethod
+    def _pattern(synonym: str) -> str:
+        if synonym.endswith("*"):
+            return " " + normalize_text(synonym[:-1]).strip()
+        return normalize_text(synonym)
+
+    def _add(self, pattern: str, mask: int) -> None:
+        state = 0
+        for char in pattern:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(0)
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state] |= mask
+
+    def _link(self) -> None:
+        """Breadth-first failure links, merging outputs along them."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.output[child] |= self.output[self.fail[child]]
+
+    def scan(self, text: str) -> int:
+        """Aspect bitmask of one text."""
+        goto, fail, output = self.goto, self.fail, self.output
+        state, mask = 0, 0
+        for char in normalize_text(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            mask |= output[state]
+        return mask
+
+
+def mask_dtype(n_aspects: int) -> np.dtype:
+    """Smallest unsigned integer type holding one bit per aspect."""
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if n_aspects <= np.iinfo(dtype).bits:
+            return np.dtype(dtype)
+    raise ValueError("At most 64 aspects fit in the bitmask.")
+
+
+def tag_reviews(texts: pd.Series, automaton: AspectAutomaton) -> pd.Series:
+    """Compact `aspect_mask` column, one scan per review."""
+    masks = [automaton.scan(text) if isinstance(text, str) else 0 for text in texts]
+    dtype = mask_dtype(len(automaton.aspects))
+    return pd.Series(
+        np.array(masks, dtype=dtype), index=texts.index, name="aspect_mask"
+    )
+
+
+def aspect_flags(masks: pd.Series, aspects: List[str]) -> pd.DataFrame:
+    """Unpacks the bitmask into one boolean column per aspect."""
+    values = masks.to_numpy().astype(np.uint64)
+    bits = np.arange(len(aspects), dtype=np.uint64)
+    flags = ((values[:, None] >> bits) & np.uint64(1)).astype(bool)
+    return pd.DataFrame(flags, index=masks.index, columns=aspects)
+
+
+def aspect_sentiment_table(
+    df: pd.DataFrame, masks: pd.Series, aspects: List[str]
+) -> pd.DataFrame:
+    """
+    Per-bank aspect x sentiment counts, with each aspect's share of all
+    reviews and its negative share.
+    """
+    flags = aspect_flags(masks, aspects)
+    flags["bank_name"] = df["bank_name"].astype(str)
+    flags["sentiment_label"] = df["sentiment_label"].astype(str)
+
+    counts = (
+        flags.groupby(["bank_name", "sentiment_label"])[aspects]
+        .sum()
+        .stack()
+        .unstack("sentiment_label", fill_value=0)
+    )
+    counts.index.names = ["bank_name", "aspect"]
+    counts.columns.name = None
+
+    mentions = counts.sum(axis=1)
+    bank_totals = flags.groupby("bank_name").size()
+    table = counts.assign(mentions=mentions)
+    table["share_of_reviews"] = (
+        mentions / bank_totals.reindex(table.index.get_level_values("bank_name")).values
+    ).round(4)
+    if "Negative" in table:
+        table["negative_share"] = (
+            table["Negative"] / mentions.where(mentions > 0)
+        ).round(4)
+    return table.reset_index()
+
+
+def main():
+    if not INPUT_FILE.exists():
+        logger.error(
+            f"Input file not found: {INPUT_FILE}. Run sentiment_analysis.py first."
+        )
+        sys.exit(1)
+
+    aspects = load_aspects()
+    automaton = AspectAutomaton(aspects)
+    logger.info(
+        f"Compiled {sum(len(s) for s in aspects.values())} synonyms for "
+        f"{len(aspects)} aspects into {len(automaton.goto)} automaton states."
+    )
+
+    df = load_reviews(
+        INPUT_FILE, usecols=["bank_name", "sentiment_label", "cleaned_text"]
+    )
+    start = time.perf_counter()
+    masks = tag_reviews(df["cleaned_text"], automaton)
+    elapsed = time.perf_counter() - start
+    chars = int(df["cleaned_text"].str.len().sum())
+    logger.info(
+        f"Tagged {len(df)} reviews ({chars / max(elapsed, 1e-9) / 1e6:.1f}M chars/s)."
+    )
+
+    TAGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    masks.rename_axis("review_row").to_csv(TAGS_FILE)
+
+    table = aspect_sentiment_table(df, masks, automaton.aspects)
+    TABLE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(TABLE_FILE, index=False)
+    logger.info(f"Aspect sentiment table saved to {TABLE_FILE}")
+
+    print("\n--- Aspect x Sentiment per Bank ---")
+    print(table.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+import heapq
+import sys
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from pathlib import Path
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.random_projection import SparseRandomProjection
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from utils import setup_logging
+from review_schema import CSV_DTYPES
+from keyword_thematic import SpaceSaving
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+INPUT_FILE = Path("data/processed/sentiment_results.csv")
+MODEL_FILE = Path("data/processed/complaint_model.npz")
+ASSIGNMENTS_FILE = Path("data/processed/complaint_clusters.csv")
+SUMMARY_FILE = Path("reports/insights/complaint_clusters.csv")
+
+READ_CHUNK_SIZE = 20_000
+HASH_FEATURES = 2**18
+N_COMPONENTS = 128  # random projection dimensions
+# Each hashed term lands on ~8 of the projected dimensions; sklearn's
+# default density (1 / sqrt(HASH_FEATURES)) would drop most terms entirely.
+PROJECTION_DENSITY = 8 / N_COMPONENTS
+N_CLUSTERS = 12
+N_EXEMPLARS = 3
+TOP_TERMS = 8
+LSH_TABLES = 24
+LSH_BITS = 10
+RANDOM_STATE = 42
+
+ChunkSource = Callable[[], Iterator[pd.DataFrame]]
+
+
+def negative_chunks(
+    file_path: Path = INPUT_FILE, chunksize: int = READ_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Streams negative reviews with their row number in the results file."""
+    columns = ["bank_name", "sentiment_label", "cleaned_text", "processed_text"]
+    offset = 0
+    for chunk in pd.read_csv(
+        file_path, usecols=columns, dtype=CSV_DTYPES, chunksize=chunksize
+    ):
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk), name="review_row")
+        offset += len(chunk)
+        chunk = chunk[chunk["sentiment_label"] == "Negative"]
+        chunk = chunk.dropna(subset=["processed_text"])
+        chunk = chunk[chunk["processed_text"].str.len() > 0]
+        if not chunk.empty:
+            yield chunk
+
+
+class ComplaintEmbedder:
+    """
+    Hashed TF-IDF followed by sparse random projection. The hashing
+    vectorizer needs no vocabulary and the IDF is a single vector, so
+    memory does not grow with the corpus.
+    """
+
+    def __init__(self):
+        self.hasher = HashingVectorizer(
+            n_features=HASH_FEATURES,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm=None,
+        )
+        self.idf = None
+        self.projection = None
+        self.n_docs = 0
+
+    def fit(self, chunks: ChunkSource) -> "ComplaintEmbedder":
+        doc_freq = np.zeros(HASH_FEATURES, dtype=np.int64)
+        n_docs = 0
+        for chunk in chunks():
+            counts = self.hasher.transform(chunk["processed_text"])
+            doc_freq += np.bincount(counts.indices, minlength=HASH_FEATURES)
+            n_docs += counts.shape[0]
+        self.n_docs = n_docs
+        # Smoothed IDF, as in sklearn's TfidfTransformer
+        self.idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1.0
+
+        projector = SparseRandomProjection(
+            n_components=N_COMPONENTS,
+            density=PROJECTION_DENSITY,
+            random_state=RANDOM_STATE,
+        ).fit(sp.csr_matrix((1, HASH_FEATURES)))
+        self.projection = projector.components_.T.tocsr().astype(np.float32)
+        return self
+
+    def transform(self, texts) -> np.ndarray:
+        tfidf = self.hasher.transform(texts).multiply(self.idf).tocsr()
+        tfidf = normalize(tfidf)
+        reduced = (tfidf @ self.projection).toarray().astype(np.float32)
+        return normalize(reduced)
+
+
+class LSHIndex:
+    """
+    Random-hyperplane LSH over the reduced vectors (cosine similarity).
+    Candidates from all tables are re-ranked by exact cosine.
+    """
+
+    def __init__(self, vectors: np.ndarray, ids: np.ndarray, planes: np.ndarray):
+        self.vectors = vectors
+        self.ids = ids
+        self.planes = planes  # (tables, bits, dims)
+        self.weights = 1 << np.arange(planes.shape[1], dtype=np.int64)
+        self.tables: List[Dict[int, np.ndarray]] = []
+        for codes in self._codes(vectors).T:
+            order = np.argsort(codes, kind="stable")
+            keys, starts = np.unique(codes[order], return_index=True)
+            self.tables.append(dict(zip(keys.tolist(), np.split(order, starts[1:]))))
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, ids: np.ndarray) -> "LSHIndex":
+        rng = np.random.default_rng(RANDOM_STATE)
+        planes = rng.standard_normal((LSH_TABLES, LSH_BITS, vectors.shape[1]))
+        return cls(vectors, ids, planes.astype(np.float32))
+
+    def _codes(self, vectors: np.ndarray) -> np.ndarray:
+        """(n, tables) bucket codes."""
+        bits = np.einsum("nd,tbd->ntb", vectors, self.planes) > 0
+        return bits.astype(np.int64) @ self.weights
+
+    def query(self, vector: np.ndarray, k: int = 5) -> List[Tuple[int, float]]:
+        """
+        Top-k stored rows by cosine. Each table is probed at the query's
+        bucket and at every bucket one bit away (multi-probe), which keeps
+        recall up without adding tables.
+        """
+        codes = self._codes(vector.reshape(1, -1))[0]
+        probes = np.concatenate([[0], self.weights])
+        candidates = [np.empty(0, dtype=np.int64)]
+        for table, code in zip(self.tables, codes):
+            for probe in (code ^ probes).tolist():
+                if probe in table:
+                    candidates.append(table[probe])
+        candidates = np.unique(np.concatenate(candidates))
+        if candidates.size == 0:
+            return []
+        scores = self.vectors[candidates] @ vector
+        best = np.argsort(-scores)[:k]
+        return [(int(self.ids[candidates[i]]), float(scores[i])) for i in best]
+
+
+def cluster_complaints(chunks: ChunkSource = negative_chunks):
+    """
+    Three streaming passes: (1) IDF, (2) mini-batch k-means partial_fit,
+    (3) assignments, exemplars and per-cluster term summaries.
+    Only the reduced vectors (float16) and a few exemplars per cluster
+    are kept in memory. Returns (embedder, kmeans, assignments, summary,
+    vectors), with vectors in the row order of `assignments`, or None
+    when there are no negative reviews to cluster.
+    """
+    embedder = ComplaintEmbedder().fit(chunks)
+    if embedder.n_docs == 0:
+        logger.warning("No negative reviews to cluster.")
+        return None
+
+    n_clusters = min(N_CLUSTERS, embedder.n_docs)
+    if n_clusters < N_CLUSTERS:
+        logger.warning(
+            f"Only {embedder.n_docs} negative reviews; using {n_clusters} "
+            f"clusters instead of {N_CLUSTERS}."
+        )
+
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=RANDOM_STATE, n_init=3)
+    buffer = []
+    for chunk in chunks():
+        buffer.append(embedder.transform(chunk["processed_text"]))
+        # partial_fit needs at least n_clusters rows per call
+        if sum(len(b) for b in buffer) >= max(n_clusters, 1024):
+            kmeans.partial_fit(np.vstack(buffer))
+            buffer = []
+    if buffer:
+        kmeans.partial_fit(np.vstack(buffer))
+
+    assignments, vectors = [], []
+    terms = {c: SpaceSaving() for c in range(n_clusters)}
+    exemplars: Dict[int, list] = {c: [] for c in range(n_clusters)}
+    analyzer = embedder.hasher.build_analyzer()
+    for chunk in chunks():
+        reduced = embedder.transform(chunk["processed_text"])
+        labels = kmeans.predict(reduced)
+        similarity = np.einsum(
+            "nd,nd->n", reduced, normalize(kmeans.cluster_centers_)[labels]
+        )
+        assignments.append(
+            pd.DataFrame(
+                {
+                    "bank_name": chunk["bank_name"].astype(str),
+                    "cluster": labels,
+                    "similarity": similarity.round(4),
+                },
+                index=chunk.index,
+            )
+        )
+        vectors.append(reduced.astype(np.float16))
+
+        rows = zip(labels, similarity, chunk.index, chunk["cleaned_text"])
+        for label, score, row, text in rows:
+            # Bounded min-heap of the reviews closest to each centroid
+            heap = exemplars[label]
+            if len(heap) < N_EXEMPLARS:
+                heapq.heappush(heap, (score, row, text))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, row, text))
+        for label, text in zip(labels, chunk["processed_text"]):
+            for term in analyzer(text):
+                if " " in term:  # bigrams describe complaints best
+                    terms[label].update(term)
+
+    assignments = pd.concat(assignments)
+    summary = summarize_clusters(assignments, terms, exemplars)
+    return embedder, kmeans, assignments, summary, np.vstack(vectors)
+
+
+def summarize_clusters(
+    assignments: pd.DataFrame,
+    terms: Dict[int, SpaceSaving],
+    exemplars: Dict[int, list],
+) -> pd.DataFrame:
+    """Size, bank mix, top bigrams and exemplar reviews per cluster."""
+    rows = []
+    for cluster, group in assignments.groupby("cluster"):
+        best = sorted(exemplars[cluster], reverse=True)
+        banks = group["bank_name"].value_counts()
+        rows.append(
+            {
+                "cluster": int(cluster),
+                "size": len(group),
+                "banks": "|".join(f"{b}:{c}" for b, c in banks.items()),
+                "top_terms": "|".join(t for t, _, _ in terms[cluster].top(TOP_TERMS)),
+                "exemplar_rows": "|".join(str(row) for _, row, _ in best),
+                "exemplars": " || ".join(text for _, _, text in best),
+            }
+        )
+    return pd.DataFrame(rows).sort_values("size", ascending=False)
+
+
+def save_model(
+    embedder: ComplaintEmbedder, vectors: np.ndarray, ids: np.ndarray, path: Path
+) -> None:
+    """Persists what is needed for similarity lookups without refitting."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    projection = embedder.projection.tocoo()
+    np.savez_compressed(
+        path,
+        idf=embedder.idf.astype(np.float32),
+        proj_row=projection.row,
+        proj_col=projection.col,
+        proj_data=projection.data,
+        vectors=vectors,
+        ids=ids,
+    )
+    logger.info(f"Complaint model saved to {path}")
+
+
+def load_index(path: Path = MODEL_FILE) -> Tuple[ComplaintEmbedder, LSHIndex]:
+    """Restores the embedder and rebuilds the LSH index."""
+    data = np.load(path)
+    embedder = ComplaintEmbedder()
+    embedder.idf = data["idf"].astype(np.float64)
+    embedder.projection = sp.csr_matrix(
+        (data["proj_data"], (data["proj_row"], data["proj_col"])),
+        shape=(HASH_FEATURES, N_COMPONENTS),
+    )
+    index = LSHIndex.build(data["vectors"].astype(np.float32), data["ids"])
+    return embedder, index
+
+
+def find_similar(text: str, k: int = 5, path: Path = MODEL_FILE) -> pd.DataFrame:
+    """
+    Nearest stored complaints to a raw review text, which first goes
+    through the same keyword preprocessing as the clustered
+    processed_text.
+    """
+    # Imported here: sentiment_analysis fetches the NLTK resources on import
+    from sentiment_analysis import preprocess_for_keywords
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+
+    processed = preprocess_for_keywords(
+        text, set(stopwords.words("english")), WordNetLemmatizer()
+    )
+    embedder, index = load_index(path)
+    matches = index.query(embedder.transform([processed])[0], k)
+    assignments = pd.read_csv(ASSIGNMENTS_FILE, index_col="review_row")
+    result = assignments.loc[[review_row for review_row, _ in matches]]
+    result["cosine"] = [score for _, score in matches]
+    return result
+
+
+def main():
+    if not INPUT_FILE.exists():
+        logger.error(
+            f"Input file not found: {INPUT_FILE}. Run sentiment_analysis.py first."
+        )
+        sys.exit(1)
+
+    # Lookup mode: complaint_clusters.py "<review text>"
+    if len(sys.argv) > 1:
+        if not MODEL_FILE.exists():
+            logger.error(
+                f"Complaint model not found: {MODEL_FILE}. Run complaint_clusters.py "
+                "without arguments first."
+            )
+            sys.exit(1)
+        print(find_similar(" ".join(sys.argv[1:])).to_string())
+        return
+
+    result = cluster_complaints()
+    if result is None:
+        return
+    embedder, kmeans, assignments, summary, vectors = result
+
+    ASSIGNMENTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    assignments.to_csv(ASSIGNMENTS_FILE)
+    SUMMARY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    summary.to_csv(SUMMARY_FILE, index=False)
+    save_model(embedder, vectors, assignments.index.to_numpy(), MODEL_FILE)
+    logger.info(
+        f"Clustered {len(assignments)} negative reviews into {kmeans.n_clusters}."
+    )
+
+    print("\n--- Complaint Clusters ---")
+    print(summary[["cluster", "size", "top_terms"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import os
+import time
+import uuid
+import pandas as pd
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence
+
+from dotenv import load_dotenv
+from psycopg2.pool import ThreadedConnectionPool
+
+from utils import setup_logging
+
+# Load environment variables from .env file
+load_dotenv()
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+# Storage backend for db_upload.py: "postgres" (default) or "sqlite"
+# (embedded file, see db_sqlite.py)
+DB_BACKEND = os.getenv("DB_BACKEND", "postgres").lower()
+
+# Database Credentials - Should be set via Environment Variables for security
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_NAME = os.getenv("DB_NAME", "bank_reviews")
+DB_USER = os.getenv("DB_USER", "postgres")
+DB_PASS = os.getenv("DB_PASS")
+DB_PORT = os.getenv("DB_PORT", "5432")
+
+POOL_MIN_CONN = int(os.getenv("DB_POOL_MIN", "1"))
+POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX", "5"))
+
+# Rows fetched per round trip by server-side cursors
+CHUNK_SIZE = 10_000
+
+_pool: Optional[ThreadedConnectionPool] = None
+
+
+def get_pool() -> ThreadedConnectionPool:
+    """Creates the shared connection pool on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ThreadedConnectionPool(
+            POOL_MIN_CONN,
+            POOL_MAX_CONN,
+            host=DB_HOST,
+            database=DB_NAME,
+            user=DB_USER,
+            password=DB_PASS,
+            port=DB_PORT,
+        )
+        logger.info(f"Connection pool ready ({POOL_MIN_CONN}-{POOL_MAX_CONN} conns)")
+    return _pool
+
+
+def close_pool() -> None:
+    """Closes every pooled connection."""
+    global _pool
+    if _pool is not None:
+        _pool.closeall()
+        _pool = None
+
+
+@contextmanager
+def get_connection():
+    """
+    Borrows a connection from the pool and returns it when done.
+    Any open transaction is rolled back before the connection is reused.
+    """
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        if not conn.closed:
+            conn.rollback()
+        pool.putconn(conn)
+
+
+def stream_query(
+    query: str, params: Optional[Sequence] = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams a query result as DataFrame chunks of at most `chunk_size`
+    rows through a named (server-side) cursor, so memory stays bounded
+    by the chunk size rather than the result size.
+    """
+    start = time.perf_counter()
+    total_rows = 0
+
+    with get_connection() as conn:
+        with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cur:
+            cur.itersize = chunk_size
+            cur.execute(query, params)
+            while True:
+                batch = cur.fetchmany(chunk_size)
+                if not batch:
+                    break
+                total_rows += len(batch)
+                columns = [col[0] for col in cur.description]
+                yield pd.DataFrame.from_records(batch, columns=columns)
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Query streamed {total_rows} rows in {elapsed:.3f}s")
+
+
+def read_query(
+    query: str, params: Optional[Sequence] = None, chunk_size: int = CHUNK_SIZE
+) -> pd.DataFrame:
+    """Runs a query through `stream_query` and concatenates the chunks."""
+    chunks = list(stream_query(query, params, chunk_size))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
+
+
+# --- CANNED ANALYSES (see database/queries.sql) ---
+
+
+def average_sentiment_by_bank() -> pd.DataFrame:
+    """Average sentiment score and review count per bank."""
+    return read_query("""
+        SELECT b.bank_name, AVG(r.sentiment_score) AS avg_sentiment,
+               COUNT(*) AS review_count
+        FROM reviews r
+        JOIN banks b ON r.bank_id = b.bank_id
+        GROUP BY b.bank_name;
+        """)
+
+
+def rating_distribution(bank_name: Optional[str] = None) -> pd.DataFrame:
+    """Rating distribution per bank, optionally restricted to one bank."""
+    return read_query(
+        """
+        SELECT b.bank_name, r.rating, COUNT(*) AS count
+        FROM reviews r
+        JOIN banks b ON r.bank_id = b.bank_id
+        WHERE %(bank_name)s IS NULL OR b.bank_name = %(bank_name)s
+        GROUP BY b.bank_name, r.rating
+        ORDER BY b.bank_name, r.rating DESC;
+        """,
+        {"bank_name": bank_name},
+    )
+
+
+def negative_reviews(bank_name: str, limit: int = 10) -> pd.DataFrame:
+    """The most negative reviews of a bank."""
+    return read_query(
+        """
+        SELECT r.review_text, r.sentiment_score
+        FROM reviews r
+        JOIN banks b ON r.bank_id = b.bank_id
+        WHERE b.bank_name = %(bank_name)s AND r.sentiment_label = 'Negative'
+        ORDER BY r.sentiment_score ASC
+        LIMIT %(limit)s;
+        """,
+        {"bank_name": bank_name, "limit": limit},
+    )
+
+
+def compare_app_versions(bank_name: str, versions: List[str]) -> pd.DataFrame:
+    """Cohort rollup rows of the given app versions of a bank."""
+    return read_query(
+        """
+        SELECT v.app_version, v.review_count, v.mean_rating, v.mean_sentiment,
+               v.rating_1, v.rating_5
+        FROM app_version_rollup v
+        JOIN banks b ON v.bank_id = b.bank_id
+        WHERE b.bank_name = %(bank_name)s AND v.app_version = ANY(%(versions)s)
+        ORDER BY v.app_version DESC;
+        """,
+        {"bank_name": bank_name, "versions": list(versions)},
+    )
+
+
+def main():
+    try:
+        print("\n--- Average Sentiment per Bank ---")
+        print(average_sentiment_by_bank())
+        print("\n--- Rating Distribution ---")
+        print(rating_distribution())
+        print("\n--- Most Negative CBE Reviews ---")
+        print(negative_reviews("CBE"))
+    except Exception as e:
+        logger.error(f"Query failed: {e}")
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
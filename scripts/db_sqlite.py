@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import time
+import pandas as pd
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+from utils import setup_logging
+from db_partitions import months_in, retention_cutoff
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+SQLITE_PATH = Path(os.getenv("SQLITE_PATH", "data/processed/bank_reviews.db"))
+SCHEMA_FILE = Path("database/schema_sqlite.sql")
+QUERIES_FILE = Path("database/queries.sql")
+
+BATCH_SIZE = 10_000  # rows per executemany call
+
+# Applied to every connection. WAL lets readers run while a load is in
+# progress, and NORMAL sync is safe under WAL (only the last commit can be
+# lost on power failure, never the database).
+CONNECTION_PRAGMAS = [
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA foreign_keys = ON;",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA cache_size = -200000;",  # ~200 MB page cache
+    "PRAGMA mmap_size = 268435456;",
+]
+
+# Extra settings for the duration of a bulk load only
+BULK_LOAD_PRAGMAS = [
+    "PRAGMA synchronous = OFF;",
+    "PRAGMA foreign_keys = OFF;",
+]
+
+# Secondary indexes are built after the load, which is much cheaper than
+# maintaining them row by row.
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_reviews_bank_id ON reviews(bank_id);",
+    "CREATE INDEX IF NOT EXISTS idx_reviews_date ON reviews(review_date);",
+    "CREATE INDEX IF NOT EXISTS idx_reviews_bank_version "
+    "ON reviews(bank_id, app_version);",
+]
+
+REFRESH_ROLLUP = """
+    DELETE FROM app_version_rollup;
+    INSERT INTO app_version_rollup
+    SELECT
+        r.bank_id,
+        COALESCE(r.app_version, 'unknown') AS app_version,
+        COUNT(*),
+        AVG(r.rating),
+        AVG(r.sentiment_score),
+        COUNT(*) FILTER (WHERE r.rating = 1),
+        COUNT(*) FILTER (WHERE r.rating = 2),
+        COUNT(*) FILTER (WHERE r.rating = 3),
+        COUNT(*) FILTER (WHERE r.rating = 4),
+        COUNT(*) FILTER (WHERE r.rating = 5)
+    FROM reviews r
+    GROUP BY r.bank_id, COALESCE(r.app_version, 'unknown');
+"""
+
+
+@contextmanager
+def get_connection(path: Path = SQLITE_PATH):
+    """Opens the embedded database with the connection pragmas applied."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        yield conn
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def setup_database(conn) -> bool:
+    """
+    Runs schema_sqlite.sql to create any missing tables (keeps existing
+    data). Returns False if it failed.
+    """
+    try:
+        with open(SCHEMA_FILE, "r") as f:
+            conn.executescript(f.read())
+        conn.commit()
+        logger.info("SQLite schema initialized.")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to setup database: {e}")
+        conn.rollback()
+        return False
+
+
+def _review_rows(df: pd.DataFrame, bank_map: dict) -> Iterator[Tuple]:
+    """Review tuples in insert order, with NaN mapped to NULL."""
+    rows = pd.DataFrame(
+        {
+            "bank_id": df["bank_name"].astype(str).map(bank_map),
+            "review_text": df["cleaned_text"],
+            "rating": df["rating"],
+            "review_date": df["review_date"].dt.strftime("%Y-%m-%d %H:%M:%S"),
+            "sentiment_label": df["sentiment_label"].astype(object),
+            "sentiment_score": df["sentiment_score"],
+            "app_version": df["app_version"].astype(object),
+        }
+    )
+    rows = rows.astype(object).where(rows.notna(), None)
+    return rows.itertuples(index=False, name=None)
+
+
+def upload_data(conn, df: pd.DataFrame, batch_size: int = BATCH_SIZE) -> bool:
+    """
+    Uploads banks and reviews in one transaction, with batched
+    executemany inserts, then builds indexes and the version rollup.
+    Returns False if the load failed (and was rolled back).
+    """
+    try:
+        for pragma in BULK_LOAD_PRAGMAS:
+            conn.execute(pragma)
+
+        # 1. Insert Banks
+        banks = [str(bank) for bank in df["bank_name"].unique()]
+        conn.executemany(
+            "INSERT OR IGNORE INTO banks (bank_name) VALUES (?);",
+            [(bank,) for bank in banks],
+        )
+        bank_map = dict(conn.execute("SELECT bank_name, bank_id FROM banks;"))
+        logger.info(f"Banks processed: {bank_map}")
+
+        # 2. Retention and replacement (no partitions here: plain DELETEs)
+        cutoff = retention_cutoff()
+        if cutoff is not None:
+            df = df[df["review_date"] >= cutoff.start_time]
+            expired = conn.execute(
+                "DELETE FROM reviews WHERE review_date < ?;",
+                (cutoff.start_time.strftime("%Y-%m-%d %H:%M:%S"),),
+            ).rowcount
+            if expired:
+                logger.info(f"Deleted {expired} reviews past the retention window.")
+        clear_months(conn, months_in(df["review_date"]), bank_map.values())
+
+        # 3. Insert Reviews
+        logger.info(f"Uploading {len(df)} reviews...")
+        start = time.perf_counter()
+        rows = _review_rows(df, bank_map)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            conn.executemany(
+                """
+                INSERT INTO reviews (bank_id, review_text, rating, review_date, sentiment_label, sentiment_score, app_version)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                batch,
+            )
+
+        for index in INDEXES:
+            conn.execute(index)
+        for statement in split_statements(REFRESH_ROLLUP):
+            conn.execute(statement)
+        conn.commit()
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Data upload complete ({len(df) / max(elapsed, 1e-9):,.0f} rows/s)."
+        )
+        return True
+    except Exception as e:
+        logger.error(f"Failed to upload data: {e}")
+        conn.rollback()
+        return False
+    finally:
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+
+
+def clear_months(conn, months: Iterable[pd.Period], bank_ids: Iterable[int]) -> None:
+    """
+    Deletes the rows of `bank_ids` in `months` so a reload replaces them
+    instead of duplicating them (db_partitions.clear_partitions on Postgres).
+    """
+    months, bank_ids = list(months), [int(b) for b in bank_ids]
+    placeholders = ", ".join("?" * len(bank_ids))
+    for month in months:
+        bounds = [
+            p.start_time.strftime("%Y-%m-%d %H:%M:%S") for p in (month, month + 1)
+        ]
+        conn.execute(
+            f"DELETE FROM reviews WHERE review_date >= ? AND review_date < ? "
+            f"AND bank_id IN ({placeholders});",
+            (*bounds, *bank_ids),
+        )
+    logger.info(f"Cleared {len(months)} month(s) of reviews for reload.")
+
+
+def split_statements(sql: str) -> List[str]:
+    """Splits a .sql file into statements, dropping comment-only chunks."""
+    statements = []
+    for chunk in sql.split(";"):
+        lines = [l for l in chunk.splitlines() if not l.strip().startswith("--")]
+        statement = "\n".join(lines).strip()
+        if statement:
+            statements.append(statement)
+    return statements
+
+
+def run_queries(conn, path: Path = QUERIES_FILE) -> List[pd.DataFrame]:
+    """Runs every analysis in queries.sql and returns the results."""
+    with open(path, "r") as f:
+        statements = split_statements(f.read())
+    results = []
+    for statement in statements:
+        cur = conn.execute(statement)
+        columns = [col[0] for col in cur.description]
+        results.append(pd.DataFrame.from_records(cur.fetchall(), columns=columns))
+    return results
+
+
+def main():
+    if not SQLITE_PATH.exists():
+        logger.error(
+            f"Database not found: {SQLITE_PATH}. Run DB_BACKEND=sqlite db_upload.py first."
+        )
+        return
+
+    with get_connection() as conn:
+        for i, result in enumerate(run_queries(conn), 1):
+            print(f"\n--- Query {i} ---")
+            print(result.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,29 @@
+import sys
 import pandas as pd
-import psycopg2
-from psycopg2 import sql
 from pathlib import Path
-import os
-from dotenv import load_dotenv
 from utils import setup_logging
-
-# Load environment variables from .env file
-load_dotenv()
+from review_schema import load_reviews
+import db_sqlite
+from db_access import DB_BACKEND, close_pool, get_connection
+from db_partitions import (
+    clear_partitions,
+    drop_expired_partitions,
+    ensure_partitions,
+    months_in,
+    retention_cutoff,
+)
 
 # --- CONFIGURATION ---
 logger = setup_logging(__name__)
 
 INPUT_FILE = Path("data/processed/sentiment_results.csv")
 
-# Database Credentials - Should be set via Environment Variables for security
-DB_HOST = os.getenv("DB_HOST")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASS = os.getenv("DB_PASS")
-DB_PORT = os.getenv("DB_PORT")
-
-
-def get_db_connection():
-    try:
-        conn = psycopg2.connect(
-            host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASS, port=DB_PORT
-        )
-        return conn
-    except Exception as e:
-        logger.error(f"Connection failed: {e}")
-        return None
-
 
-def setup_database(conn):
-    """Runs the schema.sql to create tables."""
+def setup_database(conn) -> bool:
+    """
+    Runs the schema.sql to create any missing tables (keeps existing data).
+    Returns False if it failed.
+    """
     try:
         cur = conn.cursor()
         schema_path = Path("database/schema.sql")
@@ -45,13 +34,15 @@ def setup_database(conn):
         conn.commit()
         logger.info("Database schema initialized.")
         cur.close()
+        return True
     except Exception as e:
         logger.error(f"Failed to setup database: {e}")
         conn.rollback()
+        return False
 
 
-def upload_data(conn, df):
-    """Uploads banks and reviews to the database."""
+def upload_data(conn, df) -> bool:
+    """Uploads banks and reviews to the database. Returns False if it failed."""
     cur = conn.cursor()
 
     try:
@@ -76,19 +67,31 @@ def upload_data(conn, df):
 
         logger.info(f"Banks processed: {bank_map}")
 
-        # 2. Insert Reviews
+        # 2. Partition Maintenance
+        # Rows older than the retention window would land in a partition
+        # that is about to be dropped, so skip them up front.
+        cutoff = retention_cutoff()
+        if cutoff is not None:
+            df = df[df["review_date"] >= cutoff.start_time]
+        drop_expired_partitions(cur)
+        months = months_in(df["review_date"])
+        ensure_partitions(cur, months, bank_map.values())
+        # The schema persists between runs, so replace the loaded months
+        clear_partitions(cur, months, bank_map.values())
+
+        # 3. Insert Reviews
         logger.info(f"Uploading {len(df)} reviews...")
 
         # Prepare list of tuples for batch insertion
-        # Columns: bank_id, review_text, rating, review_date, sentiment_label, sentiment_score
+        # Columns: bank_id, review_text, rating, review_date, sentiment_label, sentiment_score, app_version
 
         # Note: We need to map bank_name to bank_id
 
         for _, row in df.iterrows():
             cur.execute(
                 """
-                INSERT INTO reviews (bank_id, review_text, rating, review_date, sentiment_label, sentiment_score)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                INSERT INTO reviews (bank_id, review_text, rating, review_date, sentiment_label, sentiment_score, app_version)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
                 """,
                 (
                     bank_map[row["bank_name"]],
@@ -96,16 +99,24 @@ def upload_data(conn, df):
                     row["rating"],
                     row["review_date"],
                     row["sentiment_label"],
-                    row["sentiment_score"],
+                    # Unscored reviews carry NaN, which must be stored as
+                    # NULL rather than 'NaN'::float so AVG() skips them
+                    None if pd.isna(row["sentiment_score"]) else row["sentiment_score"],
+                    None if pd.isna(row["app_version"]) else row["app_version"],
                 ),
             )
 
+        # Refresh the per-version cohort rollup
+        cur.execute("REFRESH MATERIALIZED VIEW app_version_rollup;")
+
         conn.commit()
         logger.info("Data upload complete.")
+        return True
 
     except Exception as e:
         logger.error(f"Failed to upload data: {e}")
         conn.rollback()
+        return False
     finally:
         cur.close()
 
@@ -113,21 +124,30 @@ def upload_data(conn, df):
 def main():
     if not INPUT_FILE.exists():
         logger.error(f"Input file not found: {INPUT_FILE}")
-        return
+        sys.exit(1)
 
-    logger.info("Connecting to database...")
-    conn = get_db_connection()
+    df = load_reviews(INPUT_FILE)
 
-    if not conn:
-        logger.error("Could not connect to database. Please check credentials.")
+    if DB_BACKEND == "sqlite":
+        logger.info(f"Using embedded SQLite database at {db_sqlite.SQLITE_PATH}")
+        with db_sqlite.get_connection() as conn:
+            ok = db_sqlite.setup_database(conn) and db_sqlite.upload_data(conn, df)
+        # Non-zero exit so the pipeline retries or skips this stage
+        if not ok:
+            sys.exit(1)
         return
 
-    df = pd.read_csv(INPUT_FILE)
-
-    setup_database(conn)
-    upload_data(conn, df)
-
-    conn.close()
+    logger.info("Connecting to database...")
+    ok = False
+    try:
+        with get_connection() as conn:
+            ok = setup_database(conn) and upload_data(conn, df)
+    except Exception as e:
+        logger.error(f"Could not connect to database. Please check credentials. ({e})")
+    finally:
+        close_pool()
+    if not ok:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
-import pandas as pd
+import sys
 from pathlib import Path
 
 from utils import setup_logging
+from review_schema import load_reviews
 
 # --- CONFIGURATION ---
 logger = setup_logging(__name__)
@@ -13,9 +14,9 @@ OUTPUT_FILE = Path("reports/insights_summary.txt")
 def generate_insights():
     if not INPUT_FILE.exists():
         logger.error("Data file not found.")
-        return
+        sys.exit(1)
 
-    df = pd.read_csv(INPUT_FILE)
+    df = load_reviews(INPUT_FILE)
 
     with open(OUTPUT_FILE, "w") as f:
         f.write("FINTECH MOBILE CX ANALYTICS - AUTOMATED INSIGHTS\n")
@@ -31,6 +32,13 @@ def generate_insights():
             f.write(f"  - Average Sentiment: {avg_score:.2f}\n")
             f.write(f"  - 5-Star Reviews: {top_rating_count}\n")
             f.write(f"  - 1-Star Reviews: {low_rating_count}\n")
+
+            if "language" in bank_df.columns:
+                languages = bank_df["language"].value_counts()
+                languages = ", ".join(
+                    f"{lang}={count}" for lang, count in languages.items() if count
+                )
+                f.write(f"  - Languages: {languages}\n")
             f.write("\n")
 
     logger.info(f"Insights generated at {OUTPUT_FILE}")
@@ -1,21 +1,32 @@
+import heapq
+import json
+import sys
 import pandas as pd
 from collections import Counter
 from sklearn.feature_extraction.text import CountVectorizer
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from utils import setup_logging
+from review_schema import CSV_DTYPES, load_reviews
 
 # --- CONFIGURATION ---
 logger = setup_logging(__name__)
 
 INPUT_FILE = Path("data/processed/sentiment_results.csv")
 OUTPUT_DIR = Path("reports/insights")  # Intermediate insights storage
+KEYWORD_FILE = OUTPUT_DIR / "keyword_themes.csv"
+
+# Streaming heavy-hitters mode (bounded memory)
+SUMMARY_CAPACITY = 500  # counters kept per (bank, sentiment, n)
+ALL_SENTIMENTS = "All"  # label of the per-bank summary across sentiments
+SUMMARY_FILE = OUTPUT_DIR / "heavy_hitters.json"
+READ_CHUNK_SIZE = 50_000
 
 
 def load_data(file_path: Path) -> pd.DataFrame:
     try:
-        return pd.read_csv(file_path)
+        return load_reviews(file_path)
     except Exception as e:
         logger.error(f"Failed to load data: {e}")
         raise
@@ -38,6 +49,290 @@ def get_top_n_grams(
     return words_freq[:top_k]
 
 
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters summary with a fixed number of counters.
+
+    For every tracked term: estimate - error <= true count <= estimate.
+    Any term whose true count exceeds total / capacity is always tracked.
+    Summaries built on different shards or days can be merged.
+    """
+
+    def __init__(self, capacity: int = SUMMARY_CAPACITY):
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []  # lazy min-heap of (count, term)
+
+    def _min_term(self) -> Tuple[int, str]:
+        while True:
+            count, term = self._heap[0]
+            if self.counts.get(term) == count:
+                return count, term
+            heapq.heappop(self._heap)
+
+    def _push(self, term: str) -> None:
+        heapq.heappush(self._heap, (self.counts[term], term))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, t) for t, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def update(self, term: str, count: int = 1) -> None:
+        self.total += count
+        if term in self.counts:
+            self.counts[term] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[term] = count
+            self.errors[term] = 0
+        else:
+            floor, evicted = self._min_term()
+            heapq.heappop(self._heap)
+            del self.counts[evicted], self.errors[evicted]
+            self.counts[term] = floor + count
+            self.errors[term] = floor
+        self._push(term)
+
+    @property
+    def min_count(self) -> int:
+        """Upper bound on the count of any term that is not tracked."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return self._min_term()[0]
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Combines two summaries of the same capacity (Agarwal et al.,
+        mergeable summaries). A term missing from a full side may have
+        occurred up to that side's min_count times, which is added to both
+        its count and its error; a side that is not full saw every term.
+        """
+        if self.capacity != other.capacity:
+            raise ValueError(
+                f"Cannot merge summaries of capacity {self.capacity} "
+                f"and {other.capacity}"
+            )
+        merged = SpaceSaving(self.capacity)
+        merged.total = self.total + other.total
+        floor_a = self.min_count if len(self.counts) >= self.capacity else 0
+        floor_b = other.min_count if len(other.counts) >= other.capacity else 0
+
+        combined = {}
+        for term in set(self.counts) | set(other.counts):
+            count = self.counts.get(term, floor_a) + other.counts.get(term, floor_b)
+            error = self.errors.get(term, floor_a) + other.errors.get(term, floor_b)
+            combined[term] = (count, error)
+
+        for term, (count, error) in heapq.nlargest(
+            merged.capacity, combined.items(), key=lambda item: item[1][0]
+        ):
+            merged.counts[term] = count
+            merged.errors[term] = error
+        merged._heap = [(c, t) for t, c in merged.counts.items()]
+        heapq.heapify(merged._heap)
+        return merged
+
+    def top(self, k: int = 10) -> List[Tuple[str, int, int]]:
+        """Top-k terms as (term, estimate, max overcount)."""
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return [(term, count, self.errors[term]) for term, count in ranked[:k]]
+
+    def to_dict(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "counts": self.counts,
+            "errors": self.errors,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "SpaceSaving":
+        summary = cls(payload["capacity"])
+        summary.total = payload["total"]
+        summary.counts = dict(payload["counts"])
+        summary.errors = dict(payload["errors"])
+        summary._heap = [(c, t) for t, c in summary.counts.items()]
+        heapq.heapify(summary._heap)
+        return summary
+
+
+def iter_processed_text(
+    file_path: Path, chunksize: int = READ_CHUNK_SIZE
+) -> Iterator[Tuple[str, str, str]]:
+    """Yields (bank_name, sentiment_label, processed_text) without a full load."""
+    columns = ["bank_name", "sentiment_label", "processed_text"]
+    for chunk in pd.read_csv(
+        file_path, usecols=columns, dtype=CSV_DTYPES, chunksize=chunksize
+    ):
+        chunk = chunk.dropna(subset=["processed_text"])
+        yield from zip(
+            chunk["bank_name"].astype(str),
+            chunk["sentiment_label"].astype(str),
+            chunk["processed_text"],
+        )
+
+
+def stream_heavy_hitters(
+    rows: Iterable[Tuple[str, str, str]],
+    ngram_sizes: Tuple[int, ...] = (1, 2),
+    capacity: int = SUMMARY_CAPACITY,
+) -> Dict[Tuple[str, str, int], SpaceSaving]:
+    """
+    Consumes (bank, sentiment, text) rows once and keeps one fixed-size
+    summary per (bank, sentiment, n), plus one per (bank, ALL_SENTIMENTS, n)
+    for bank-level rankings. Tokenization matches get_top_n_grams.
+    """
+    analyzers = {
+        n: CountVectorizer(ngram_range=(n, n), stop_words="english").build_analyzer()
+        for n in ngram_sizes
+    }
+    summaries: Dict[Tuple[str, str, int], SpaceSaving] = {}
+    for bank, label, text in rows:
+        for n, analyze in analyzers.items():
+            terms = analyze(text)
+            for key in ((bank, label, n), (bank, ALL_SENTIMENTS, n)):
+                summary = summaries.get(key)
+                if summary is None:
+                    summary = summaries[key] = SpaceSaving(capacity)
+                for term in terms:
+                    summary.update(term)
+    return summaries
+
+
+def merge_summaries(
+    summaries: Iterable[Dict[Tuple[str, str, int], SpaceSaving]],
+) -> Dict[Tuple[str, str, int], SpaceSaving]:
+    """Merges per-shard or per-day summary sets key by key."""
+    merged: Dict[Tuple[str, str, int], SpaceSaving] = {}
+    for summary_set in summaries:
+        for key, summary in summary_set.items():
+            merged[key] = merged[key].merge(summary) if key in merged else summary
+    return merged
+
+
+def combined_top(
+    summaries: Dict[Tuple[str, str, int], SpaceSaving],
+    bank: str,
+    n: int,
+    top_k: int = 10,
+    label: Optional[str] = None,
+) -> List[Tuple[str, int, int]]:
+    """
+    Top terms for a bank across sentiments (or for one sentiment). The
+    bank-level summary is used as is; merging the per-sentiment summaries
+    would only loosen the error bounds.
+    """
+    label = ALL_SENTIMENTS if label is None else label
+    summary = summaries.get((bank, label, n))
+    if summary is not None:
+        return summary.top(top_k)
+    if label != ALL_SENTIMENTS:
+        return []
+
+    # Summaries saved without a bank-level entry
+    parts = [
+        s
+        for (b, lab, size), s in summaries.items()
+        if b == bank and size == n and lab != ALL_SENTIMENTS
+    ]
+    merged = None
+    for part in parts:
+        merged = part if merged is None else merged.merge(part)
+    return merged.top(top_k) if merged is not None else []
+
+
+def save_summaries(
+    summaries: Dict[Tuple[str, str, int], SpaceSaving], output_path: Path
+) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = [
+        {"bank_name": b, "sentiment_label": lab, "n": n, **s.to_dict()}
+        for (b, lab, n), s in sorted(summaries.items())
+    ]
+    with open(output_path, "w") as f:
+        json.dump(payload, f)
+    logger.info(f"Heavy-hitter summaries saved to {output_path}")
+
+
+def load_summaries(file_path: Path) -> Dict[Tuple[str, str, int], SpaceSaving]:
+    with open(file_path, "r") as f:
+        payload = json.load(f)
+    return {
+        (p["bank_name"], p["sentiment_label"], p["n"]): SpaceSaving.from_dict(p)
+        for p in payload
+    }
+
+
+def compare_with_exact(
+    df: pd.DataFrame,
+    summaries: Dict[Tuple[str, str, int], SpaceSaving],
+    top_k: int = 10,
+) -> pd.DataFrame:
+    """
+    Per bank and n-gram size: overlap of the streaming top-k with the exact
+    top-k, and the largest absolute count error over the reported terms.
+    """
+    rows = []
+    for bank in sorted(df["bank_name"].astype(str).unique()):
+        corpus = df[df["bank_name"] == bank]["processed_text"].dropna().tolist()
+        for n in (1, 2):
+            exact = Counter()
+            analyze = CountVectorizer(
+                ngram_range=(n, n), stop_words="english"
+            ).build_analyzer()
+            for text in corpus:
+                exact.update(analyze(text))
+
+            approx = combined_top(summaries, bank, n, top_k)
+            exact_top = {term for term, _ in exact.most_common(top_k)}
+            rows.append(
+                {
+                    "bank_name": bank,
+                    "n": n,
+                    "top_k_recall": len(exact_top & {t for t, _, _ in approx})
+                    / max(len(exact_top), 1),
+                    "max_abs_error": max(
+                        (abs(est - exact[t]) for t, est, _ in approx), default=0
+                    ),
+                    "guaranteed_bound": max((err for _, _, err in approx), default=0),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+# (kind, n, top_k, sentiment filter) - mirrors analyze_bank_themes
+THEME_SPECS = [
+    ("keyword", 1, 10, None),
+    ("theme", 2, 5, None),
+    ("pain_point", 2, 3, "Negative"),
+]
+
+
+def extract_themes(df: pd.DataFrame, bank: str) -> pd.DataFrame:
+    """Top keywords, themes and pain points of one bank as a long table."""
+    rows = []
+    for kind, n, top_k, label in THEME_SPECS:
+        subset = df if label is None else df[df["sentiment_label"] == label]
+        corpus = subset["processed_text"].dropna().tolist()
+        for rank, (term, count) in enumerate(get_top_n_grams(corpus, n, top_k), 1):
+            rows.append(
+                {
+                    "bank_name": bank,
+                    "kind": kind,
+                    "rank": rank,
+                    "term": term,
+                    "count": int(count),
+                }
+            )
+    return pd.DataFrame(rows, columns=["bank_name", "kind", "rank", "term", "count"])
+
+
+def save_themes(themes: pd.DataFrame, output_path: Path) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    themes.to_csv(output_path, index=False)
+    logger.info(f"Keyword themes saved to {output_path}")
+
+
 def analyze_bank_themes(df: pd.DataFrame, bank_name: str):
     """
     Analyzes keywords and themes for a specific bank.
@@ -76,11 +371,36 @@ def analyze_bank_themes(df: pd.DataFrame, bank_name: str):
             print(f"  - {phrase}: {freq}")
 
 
+def run_streaming():
+    """Bounded-memory mode: one pass over processed_text, fixed-size summaries."""
+    summaries = stream_heavy_hitters(iter_processed_text(INPUT_FILE))
+    save_summaries(summaries, SUMMARY_FILE)
+
+    banks = sorted({bank for bank, _, _ in summaries})
+    for bank in banks:
+        print(f"\n=== Streaming Analysis for {bank} ===")
+        print("Top 10 Keywords (estimate, max overcount):")
+        for term, est, err in combined_top(summaries, bank, n=1, top_k=10):
+            print(f"  - {term}: {est} (+{err})")
+        print("\nTop 3 Pain Points (Negative Bigrams):")
+        for term, est, err in combined_top(
+            summaries, bank, n=2, top_k=3, label="Negative"
+        ):
+            print(f"  - {term}: {est} (+{err})")
+
+    print("\n--- Streaming vs Exact Counts ---")
+    print(compare_with_exact(load_data(INPUT_FILE), summaries).to_string(index=False))
+
+
 def main():
     if not INPUT_FILE.exists():
         logger.error(
             f"Input file not found: {INPUT_FILE}. Run sentiment_analysis.py first."
         )
+        sys.exit(1)
+
+    if "--streaming" in sys.argv:
+        run_streaming()
         return
 
     df = load_data(INPUT_FILE)
@@ -90,6 +410,16 @@ def main():
     for bank in banks:
         analyze_bank_themes(df, bank)
 
+    # Same long table as the sharded run (sharded_pipeline.py)
+    themes = pd.concat(
+        [
+            extract_themes(df[df["bank_name"] == bank], bank)
+            for bank in sorted(df["bank_name"].astype(str).unique())
+        ],
+        ignore_index=True,
+    )
+    save_themes(themes, KEYWORD_FILE)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,311 @@
+import re
+import string
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from pathlib import Path
+from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+from typing import Optional
+
+from utils import setup_logging
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+INPUT_FILE = Path("data/clean/reviews_clean.csv")
+REPORT_FILE = Path("reports/insights/fast_sentiment_agreement.csv")
+
+BATCH_SIZE = 50_000
+NORMALIZE_ALPHA = 15  # VADER's compound normalization constant
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+_PUNCTUATION = f"[{re.escape(string.punctuation)}]"
+
+
+def label_scores(scores: np.ndarray) -> np.ndarray:
+    """Positive / Negative / Neutral labels for compound scores."""
+    return np.select(
+        [scores >= POSITIVE_THRESHOLD, scores <= NEGATIVE_THRESHOLD],
+        ["Positive", "Negative"],
+        "Neutral",
+    )
+
+
+class LexiconScorer:
+    """
+    Bulk approximation of VADER's compound score.
+
+    The VADER lexicon becomes a weight vector over a shared vocabulary.
+    A batch of texts is tokenized into one flat token table, VADER's
+    context rules are evaluated on shifted copies of that table, and each
+    token occurrence ends up as (multiplier, additive) terms. Document
+    sums are then one sparse document-term matrix x weight vector product
+    plus the additive terms.
+
+    Rules kept: caps emphasis, booster/dampener words (3-word window with
+    decay), negation (including "never so/this"), "least", "kind of",
+    "but" re-weighting, '!'/'?' amplification and the compound
+    normalization. Rules dropped: multi-word idioms, and VADER's quirk of
+    evaluating repeated tokens at their first position.
+    """
+
+    def __init__(self, analyzer: Optional[SentimentIntensityAnalyzer] = None):
+        analyzer = analyzer or SentimentIntensityAnalyzer()
+        self.constants = VaderConstants()
+        self.vocabulary = pd.Index(sorted(analyzer.lexicon))
+        self.weights = np.array(
+            [analyzer.lexicon[term] for term in self.vocabulary], dtype=np.float64
+        )
+        self.boosters = self.constants.BOOSTER_DICT
+        self.negations = set(self.constants.NEGATE)
+
+        # A token is stripped to its word when one PUNC_LIST entry is
+        # attached before or after it (as SentiText does).
+        puncs = "|".join(
+            re.escape(p)
+            for p in sorted(self.constants.PUNC_LIST, key=len, reverse=True)
+        )
+        word = rf"(?:(?!{_PUNCTUATION})\S){{2,}}"
+        self._strip_pattern = (
+            rf"^(?:(?:{puncs})(?P<a>{word})|(?P<b>{word})(?:{puncs}))$"
+        )
+
+    # --- tokenization ---
+
+    def _tokens(self, texts: pd.Series) -> pd.DataFrame:
+        """
+        Flat token table: one row per token, in document order. Token
+        properties are computed once per distinct token and gathered.
+        """
+        tokens = texts.str.split().explode().dropna()
+        tokens = tokens[tokens.str.len() > 1]
+        ids, distinct = pd.factorize(tokens.to_numpy())
+
+        distinct = pd.Series(distinct, dtype=object)
+        stripped = distinct.str.extract(self._strip_pattern)
+        distinct = stripped["a"].fillna(stripped["b"]).fillna(distinct)
+        lower = distinct.str.lower()
+        props = pd.DataFrame(
+            {
+                "lower": lower,
+                "code": self.vocabulary.get_indexer(lower),
+                "is_upper": distinct.str.isupper().astype(bool),
+                "booster": lower.map(self.boosters).fillna(0.0),
+                "is_booster": lower.isin(self.boosters),
+                "negated": lower.isin(self.negations)
+                | lower.str.contains("n't", regex=False),
+            }
+        )
+
+        table = props.iloc[ids].reset_index(drop=True)
+        table["doc"] = tokens.index.to_numpy()
+        table["pos"] = table.groupby("doc").cumcount().to_numpy()
+        return table
+
+    # --- scoring ---
+
+    def compound(self, texts) -> np.ndarray:
+        """Approximate VADER compound scores (NaN texts score 0.0)."""
+        texts = pd.Series(texts).reset_index(drop=True)
+        n_docs = len(texts)
+        valid = texts.map(lambda t: isinstance(t, str))
+        texts = texts.where(valid, "")
+        table = self._tokens(texts)
+        if table.empty:
+            return np.zeros(n_docs)
+
+        C = self.constants
+        doc = table["doc"].to_numpy()
+        pos = table["pos"].to_numpy()
+        lower = table["lower"].to_numpy(dtype=object)
+        code = table["code"].to_numpy()
+        in_lexicon = code >= 0
+        is_upper = table["is_upper"].to_numpy()
+        booster = table["booster"].to_numpy()
+        is_booster = table["is_booster"].to_numpy()
+        negated = table["negated"].to_numpy()
+
+        # Some but not all words in ALL CAPS
+        n_upper = np.bincount(doc, weights=is_upper, minlength=n_docs)
+        n_words = np.bincount(doc, minlength=n_docs)
+        cap_diff = ((n_upper > 0) & (n_upper < n_words))[doc]
+
+        def shifted(values, k, fill):
+            out = np.full_like(values, fill)
+            out[k:] = values[:-k]
+            return out
+
+        following = np.empty_like(lower)
+        following[:-1] = lower[1:]
+        following[-1] = ""
+        same_doc_next = np.zeros(len(doc), dtype=bool)
+        same_doc_next[:-1] = doc[1:] == doc[:-1]
+        kind_of = (lower == "kind") & same_doc_next & (following == "of")
+
+        scored = in_lexicon & ~is_booster & ~kind_of
+        base = np.where(scored, self.weights[code], 0.0)
+
+        # Each occurrence's valence is tracked as base * mult + add
+        mult = np.where(scored, 1.0, 0.0)
+        add = np.where(
+            scored & is_upper & cap_diff, np.where(base > 0, C.C_INCR, -C.C_INCR), 0.0
+        )
+
+        for k, decay in ((1, 1.0), (2, 0.95), (3, 0.9)):
+            has_prev = pos >= k
+            prev_in_lexicon = shifted(in_lexicon, k, True)
+            apply = scored & has_prev & ~prev_in_lexicon
+
+            # Booster / dampener k words back (sign follows the valence so far)
+            current = base * mult + add
+            scalar = shifted(booster, k, 0.0) * np.where(current < 0, -1.0, 1.0)
+            scalar += np.where(
+                shifted(is_booster, k, False) & shifted(is_upper, k, False) & cap_diff,
+                np.where(current > 0, C.C_INCR, -C.C_INCR),
+                0.0,
+            )
+            add += np.where(apply, scalar * decay, 0.0)
+
+            # Negation k words back
+            prev_neg = shifted(negated, k, False)
+            factor = np.where(prev_neg, C.N_SCALAR, 1.0)
+            if k == 2:
+                never_so = (shifted(lower, 2, "") == "never") & np.isin(
+                    shifted(lower, 1, ""), ["so", "this"]
+                )
+                factor = np.where(never_so, 1.5, factor)
+            elif k == 3:
+                never_so = (
+                    (shifted(lower, 3, "") == "never")
+                    & np.isin(shifted(lower, 2, ""), ["so", "this"])
+                ) | np.isin(shifted(lower, 1, ""), ["so", "this"])
+                factor = np.where(never_so, 1.25, factor)
+            factor = np.where(apply, factor, 1.0)
+            mult *= factor
+            add *= factor
+
+        # "least" (but not "at least" / "very least") negates
+        prev1 = shifted(lower, 1, "")
+        prev2 = shifted(lower, 2, "")
+        least = (
+            scored
+            & (pos >= 1)
+            & (prev1 == "least")
+            & ~shifted(in_lexicon, 1, True)
+            & ~((pos >= 2) & np.isin(prev2, ["at", "very"]))
+        )
+        mult = np.where(least, mult * C.N_SCALAR, mult)
+        add = np.where(least, add * C.N_SCALAR, add)
+
+        # "but": earlier sentiment x0.5, later sentiment x1.5
+        is_but = lower == "but"
+        but_pos = np.full(n_docs, np.iinfo(np.int64).max)
+        np.minimum.at(but_pos, doc[is_but], pos[is_but])
+        has_but = but_pos[doc] != np.iinfo(np.int64).max
+        but_factor = np.where(
+            has_but & (pos < but_pos[doc]),
+            0.5,
+            np.where(has_but & (pos > but_pos[doc]), 1.5, 1.0),
+        )
+        mult *= but_factor
+        add *= but_factor
+
+        # Document sums: sparse DTM (summed multipliers) x lexicon weights
+        dtm = sp.csr_matrix(
+            (mult[scored], (doc[scored], code[scored])),
+            shape=(n_docs, len(self.vocabulary)),
+        )
+        total = dtm @ self.weights + np.bincount(doc, weights=add, minlength=n_docs)
+
+        # Punctuation emphasis and normalization
+        exclaims = np.minimum(texts.str.count("!").to_numpy(), 4) * 0.292
+        questions = texts.str.count(r"\?").to_numpy()
+        questions = np.where(
+            questions > 3, 0.96, np.where(questions > 1, questions * 0.18, 0.0)
+        )
+        total += np.sign(total) * (exclaims + questions)
+
+        compound = total / np.sqrt(total * total + NORMALIZE_ALPHA)
+        compound = np.where(n_words > 0, compound, 0.0)
+        return np.round(np.clip(compound, -1.0, 1.0), 4)
+
+    def score(self, texts, batch_size: int = BATCH_SIZE) -> np.ndarray:
+        """Compound scores for any number of texts, batch by batch."""
+        texts = pd.Series(texts).reset_index(drop=True)
+        return np.concatenate(
+            [
+                self.compound(texts.iloc[start : start + batch_size])
+                for start in range(0, max(len(texts), 1), batch_size)
+            ]
+        )[: len(texts)]
+
+
+def agreement_report(texts: pd.Series) -> pd.DataFrame:
+    """
+    Scores `texts` with the exact SentimentIntensityAnalyzer and with the
+    bulk scorer, and summarizes label agreement and throughput.
+    """
+    sia = SentimentIntensityAnalyzer()
+    scorer = LexiconScorer(sia)
+
+    start = time.perf_counter()
+    exact = np.array(
+        [
+            sia.polarity_scores(t)["compound"] if isinstance(t, str) else 0.0
+            for t in texts
+        ]
+    )
+    exact_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = scorer.score(texts)
+    fast_s = time.perf_counter() - start
+
+    exact_labels, fast_labels = label_scores(exact), label_scores(fast)
+    print("\n--- Exact (rows) vs Fast (columns) Labels ---")
+    print(
+        pd.crosstab(
+            exact_labels, fast_labels, rownames=["exact"], colnames=["fast"]
+        ).to_string()
+    )
+
+    return pd.DataFrame(
+        [
+            {
+                "reviews": len(texts),
+                "label_agreement": round(
+                    float((exact_labels == fast_labels).mean()), 4
+                ),
+                "mean_abs_compound_diff": round(float(np.abs(exact - fast).mean()), 4),
+                "compound_correlation": round(float(np.corrcoef(exact, fast)[0, 1]), 4),
+                "exact_rows_per_s": round(len(texts) / exact_s),
+                "fast_rows_per_s": round(len(texts) / fast_s),
+            }
+        ]
+    )
+
+
+def main():
+    if not INPUT_FILE.exists():
+        logger.error(f"Input file not found: {INPUT_FILE}. Run preprocess.py first.")
+        return
+
+    # Imported here: sentiment_analysis fetches the NLTK resources on import
+    from sentiment_analysis import VADER_LANGUAGES, load_data, routed_to
+
+    df = load_data(INPUT_FILE)
+    texts = df.loc[routed_to(df, VADER_LANGUAGES), "cleaned_text"]
+    report = agreement_report(texts)
+
+    REPORT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(REPORT_FILE, index=False)
+    logger.info(f"Agreement report saved to {REPORT_FILE}")
+
+    print("\n--- Fast vs Exact Sentiment ---")
+    print(report.T.to_string(header=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
+import os
 import subprocess
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from utils import setup_logging
 
@@ -9,6 +14,60 @@ logger = setup_logging(__name__)
 
 SCRIPTS_DIR = Path("scripts")
 
+# Stages run as separate processes, so threads are enough to drive them
+MAX_WORKERS = int(os.getenv("PIPELINE_STAGE_WORKERS", "4"))
+MAX_RETRIES = int(os.getenv("PIPELINE_STAGE_RETRIES", "1"))
+
+
+@dataclass
+class Stage:
+    """One pipeline script and the stages whose outputs it reads."""
+
+    name: str
+    script: str
+    depends_on: List[str] = field(default_factory=list)
+
+
+# 1. Data Collection (Optional if data exists, but good to include)
+# scraper.py is not scheduled to avoid re-scraping in this demo run,
+# but in a real pipeline it would be the root stage.
+SERIAL_STAGES = [
+    # 2. Preprocessing -> 3. Sentiment Analysis
+    Stage("preprocess", "preprocess.py"),
+    Stage("sentiment", "sentiment_analysis.py", ["preprocess"]),
+]
+# 2-3. Per-bank shards run preprocessing, sentiment and keywords in
+# parallel worker processes and merge into the usual artifacts.
+SHARDED_STAGES = [Stage("sentiment", "sharded_pipeline.py")]
+
+# Everything below only reads sentiment_results.csv
+ANALYSIS_STAGES = [
+    # 4. Keyword/Thematic Analysis (already part of the sharded run)
+    Stage("keywords", "keyword_thematic.py", ["sentiment"]),
+    # 4b. App Version Cohort Index (release-regression lookups)
+    Stage("version_cohorts", "version_cohorts.py", ["sentiment"]),
+    # 4c. Complaint Clustering (negative-review triage + similarity index)
+    Stage("complaint_clusters", "complaint_clusters.py", ["sentiment"]),
+    # 4d. Aspect Tagging (login, OTP, transfer, ... x sentiment per bank)
+    Stage("aspects", "aspect_tagger.py", ["sentiment"]),
+    # 4e. Sentiment Drop Alerts (daily/weekly/monthly per bank)
+    Stage("sentiment_alerts", "sentiment_aggregates.py", ["sentiment"]),
+    # 4f. Term Cube (rising negative terms per bank)
+    Stage("term_cube", "term_cube.py", ["sentiment"]),
+    # 5. Database Upload (requires .env or env vars to be set)
+    Stage("db_upload", "db_upload.py", ["sentiment"]),
+    # 6. Visualizations & Insights
+    Stage("visualizations", "visualizations.py", ["sentiment"]),
+    Stage("insights", "insights.py", ["sentiment"]),
+]
+
+
+def build_stages(sharded: bool) -> List[Stage]:
+    if sharded:
+        analysis = [s for s in ANALYSIS_STAGES if s.name != "keywords"]
+        return SHARDED_STAGES + analysis
+    return SERIAL_STAGES + ANALYSIS_STAGES
+
 
 def run_script(script_name):
     """Runs a python script located in the scripts directory."""
@@ -31,37 +90,145 @@ def run_script(script_name):
         return False
 
 
-def main():
-    logger.info("Starting Fintech Mobile CX Analytics Pipeline...")
-
-    # 1. Data Collection (Optional if data exists, but good to include)
-    # Skipping scraper.py for now to avoid re-scraping in this demo run,
-    # but in a real pipeline, it would be first.
-    # if not run_script("scraper.py"): return
-
-    # 2. Preprocessing
-    if not run_script("preprocess.py"):
-        return
-
-    # 3. Sentiment Analysis
-    if not run_script("sentiment_analysis.py"):
-        return
+def validate(stages: List[Stage]) -> None:
+    """
+    Every dependency must be declared before the stage that needs it,
+    which also rules out cycles and keeps the list in topological order.
+    """
+    seen = set()
+    for stage in stages:
+        missing = set(stage.depends_on) - seen
+        if missing:
+            raise ValueError(
+                f"Stage '{stage.name}' depends on undeclared stage(s) {missing}"
+            )
+        seen.add(stage.name)
+
+
+def run_dag(
+    stages: List[Stage], max_workers: int = MAX_WORKERS, max_retries: int = MAX_RETRIES
+) -> Dict[str, dict]:
+    """
+    Runs stages as soon as all their dependencies have succeeded, up to
+    `max_workers` at a time. A failed stage is retried up to
+    `max_retries` times; if it still fails, only its dependents are
+    skipped and every unaffected branch keeps running.
+    Returns per-stage status, attempts, first start time and the time
+    spent in each attempt (queueing between retries is not counted).
+    """
+    validate(stages)
+    results = {
+        s.name: {"status": "pending", "attempts": 0, "start": None, "secs": 0.0}
+        for s in stages
+    }
+    origin = time.perf_counter()
+
+    def attempt(stage: Stage) -> Tuple[bool, float, float]:
+        start = time.perf_counter() - origin
+        try:
+            ok = run_script(stage.script)
+        except Exception as e:
+            logger.error(f"Could not run {stage.script}: {e}")
+            ok = False
+        return ok, start, time.perf_counter() - origin
+
+    def skip_dependents(failed: str) -> None:
+        for stage in stages:
+            state = results[stage.name]
+            if failed in stage.depends_on and state["status"] == "pending":
+                state["status"] = f"skipped ({failed} failed)"
+                skip_dependents(stage.name)
+
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while True:
+            for stage in stages:
+                state = results[stage.name]
+                deps_ok = all(results[d]["status"] == "ok" for d in stage.depends_on)
+                if state["status"] == "pending" and deps_ok:
+                    state["status"] = "running"
+                    state["attempts"] += 1
+                    running[pool.submit(attempt, stage)] = stage.name
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                state = results[name]
+                ok, start, end = future.result()
+                if state["start"] is None:
+                    state["start"] = start
+                state["secs"] += end - start
+
+                if ok:
+                    state["status"] = "ok"
+                elif state["attempts"] <= max_retries:
+                    logger.warning(
+                        f"Stage '{name}' failed (attempt {state['attempts']}). Retrying..."
+                    )
+                    state["status"] = "pending"
+                else:
+                    state["status"] = "failed"
+                    logger.error(
+                        f"Stage '{name}' failed after {state['attempts']} "
+                        "attempt(s). Skipping its dependents."
+                    )
+                    skip_dependents(name)
+
+    return results
+
+
+def critical_path(stages: List[Stage], results: Dict[str, dict]) -> List[str]:
+    """
+    Longest chain of dependent stages by measured duration: the stages
+    that bounded the wall clock of this run.
+    """
+    finish: Dict[str, Tuple[float, Optional[str]]] = {}
+    for stage in stages:  # topological (see validate)
+        parent = max(stage.depends_on, key=lambda d: finish[d][0], default=None)
+        before = finish[parent][0] if parent else 0.0
+        finish[stage.name] = (before + results[stage.name]["secs"], parent)
+
+    path, node = [], max(finish, key=lambda n: finish[n][0])
+    while node:
+        path.append(node)
+        node = finish[node][1]
+    return path[::-1]
+
+
+def print_summary(stages: List[Stage], results: Dict[str, dict], wall: float) -> None:
+    print("\n--- Pipeline Stage Summary ---")
+    print(f"{'stage':<20}{'status':<32}{'tries':>6}{'start':>9}{'secs':>9}")
+    for stage in stages:
+        r = results[stage.name]
+        if r["start"] is None:
+            start = secs = "-"
+        else:
+            start = f"{r['start']:.2f}"
+            secs = f"{r['secs']:.2f}"
+        print(f"{stage.name:<20}{r['status']:<32}{r['attempts']:>6}{start:>9}{secs:>9}")
+
+    path = critical_path(stages, results)
+    path_secs = sum(results[n]["secs"] for n in path)
+    serial = sum(r["secs"] for r in results.values())
+    print(f"Critical path: {' -> '.join(path)} ({path_secs:.2f}s)")
+    print(f"Wall clock: {wall:.2f}s | Serial sum: {serial:.2f}s")
 
-    # 4. Keyword/Thematic Analysis
-    if not run_script("keyword_thematic.py"):
-        return
 
-    # 5. Database Upload
-    # Note: Requires .env or env vars to be set
-    if not run_script("db_upload.py"):
-        return
+def main():
+    logger.info("Starting Fintech Mobile CX Analytics Pipeline...")
 
-    # 6. Visualizations & Insights
-    if not run_script("visualizations.py"):
-        return
-    if not run_script("insights.py"):
-        return
+    stages = build_stages(sharded="--sharded" in sys.argv)
+    start = time.perf_counter()
+    results = run_dag(stages)
+    print_summary(stages, results, time.perf_counter() - start)
 
+    failed = [name for name, r in results.items() if r["status"] != "ok"]
+    if failed:
+        logger.error(f"Pipeline finished with incomplete stages: {failed}")
+        sys.exit(1)
     logger.info("Pipeline Execution Completed Successfully.")
 
 
@@ -1,9 +1,12 @@
 import pandas as pd
 import re
+import sys
 from pathlib import Path
 from typing import Optional
 
 from utils import setup_logging
+from review_schema import apply_review_dtypes, load_reviews
+from raw_archive import RawArchive, snapshot_name
 
 # --- CONFIGURATION ---
 logger = setup_logging(__name__)
@@ -12,20 +15,76 @@ logger = setup_logging(__name__)
 INPUT_DIR = Path("data/raw")
 OUTPUT_DIR = Path("data/clean")
 RAW_FILE_NAME = "reviews_raw_2025-11-28.csv"  # Explicitly using the validated file
+MIN_RECORDS = 1200  # 400 per bank
+
+# Language detection: Unicode blocks and thresholds
+ETHIOPIC_PATTERN = r"[\u1200-\u139F\u2D80-\u2DDF\uAB00-\uAB2F]"
+ETHIOPIC_THRESHOLD = 0.8  # share of letters that makes a review Amharic
+MIXED_THRESHOLD = 0.2  # share of letters that makes a review mixed
+LATIN_THRESHOLD = 0.8
+ENGLISH_RATIO = 0.1  # below this share of English markers, check translit
+TRANSLIT_RATIO = 0.2  # share of romanized Amharic markers for "am-latn"
+MIN_TRANSLIT_HITS = 2  # and at least this many of them in the review
+ENGLISH_MARKERS = (
+    r"\b(?:the|a|an|and|or|but|is|are|was|it|this|that|to|of|in|on|for|with|"
+    r"not|no|i|you|my|me|we|very|so|can|cant|don|dont|app|bank|good|bad|nice|"
+    r"best|worst|great|work|works|please|update|money|transfer|account)\b"
+)
+# Only romanizations that are not also common English (or other Latin-script)
+# words, so "new", "gin", "hulu" etc. are deliberately left out
+TRANSLIT_MARKERS = (
+    r"\b(?:betam|tiru|konjo|gobez|yelem|yelew|alew|endet|lemin|yihe|ahun|"
+    r"yene|sira|yasfelgal|ayseram|amesegnalehu|ameseginalehu|ebakachihu|"
+    r"ebakih|bicha|yimechal|aydelem)\b"
+)
+
+
+def load_archived(input_dir: Path, snapshot: str) -> Optional[pd.DataFrame]:
+    """
+    Streams a snapshot from the raw archive segment by segment into compact
+    typed chunks (rows come out in archive order, not the snapshot's
+    original order). Returns None if the snapshot is missing, empty or
+    unreadable.
+    """
+    archive = RawArchive(input_dir / "archive")
+    if not archive.has_snapshot(snapshot):
+        return None
+
+    logger.info(f"Streaming {snapshot} from the raw archive")
+    try:
+        chunks = list(archive.stream(snapshot))
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning(f"Archived snapshot {snapshot} is unreadable: {e}")
+        return None
+    if not chunks:
+        logger.warning(f"Archived snapshot {snapshot} is empty.")
+        return None
+    return apply_review_dtypes(pd.concat(chunks, ignore_index=True))
 
 
 def load_data(input_dir: Path, filename: str) -> Optional[pd.DataFrame]:
     """
     Loads the specific raw data file.
+    Falls back to the raw archive when only the snapshot's manifest exists,
+    and then to the newest reviews_raw_*.csv in `input_dir`.
     """
     file_path = input_dir / filename
     try:
-        if not file_path.exists():
-            logger.error(f"File not found: {file_path}")
-            return None
+        if file_path.exists():
+            logger.info(f"Loading dataset: {file_path}")
+            return load_reviews(file_path)
+
+        df = load_archived(input_dir, snapshot_name(file_path))
+        if df is not None:
+            return df
 
-        logger.info(f"Loading dataset: {file_path}")
-        return pd.read_csv(file_path)
+        candidates = sorted(input_dir.glob("reviews_raw_*.csv"))
+        if candidates:
+            logger.warning(f"{filename} not available. Using {candidates[-1].name}")
+            return load_reviews(candidates[-1])
+
+        logger.error(f"File not found: {file_path}")
+        return None
 
     except Exception as e:
         logger.error(f"Failed to load data: {str(e)}")
@@ -47,9 +106,52 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
-def process_pipeline(df: pd.DataFrame) -> pd.DataFrame:
+def detect_language(text: pd.Series) -> pd.Series:
+    """
+    Tags each review with a language/script code using Unicode-block
+    ratios computed over the whole column (no per-row Python calls):
+    - "am":      mostly Ethiopic script
+    - "mixed":   a substantial share of Ethiopic alongside Latin text
+    - "en":      Latin script
+    - "am-latn": Latin script dominated by romanized Amharic words
+    - "und":     no letters at all (emoji, digits, punctuation)
+    - "other":   letters from other scripts
+    """
+    text = text.fillna("").astype(str)
+    letters = text.str.count(r"[^\W\d_]")
+    ethiopic = text.str.count(ETHIOPIC_PATTERN)
+    latin = text.str.count(r"[A-Za-z]")
+    words = text.str.count(r"\S+")
+    lowered = text.str.lower()
+    english = lowered.str.count(ENGLISH_MARKERS)
+    translit = lowered.str.count(TRANSLIT_MARKERS)
+
+    safe_letters = letters.where(letters > 0, 1)
+    ethiopic_ratio = ethiopic / safe_letters
+    latin_ratio = latin / safe_letters
+    safe_words = words.where(words > 0, 1)
+    english_ratio = english / safe_words
+    translit_ratio = translit / safe_words
+
+    language = pd.Series("other", index=text.index)
+    is_latin = latin_ratio >= LATIN_THRESHOLD
+    language[is_latin] = "en"
+    is_translit = (
+        (translit >= MIN_TRANSLIT_HITS)
+        & (translit_ratio >= TRANSLIT_RATIO)
+        & (english_ratio < ENGLISH_RATIO)
+    )
+    language[is_latin & is_translit] = "am-latn"
+    language[ethiopic_ratio >= MIXED_THRESHOLD] = "mixed"
+    language[ethiopic_ratio >= ETHIOPIC_THRESHOLD] = "am"
+    language[letters == 0] = "und"
+    return language
+
+
+def process_pipeline(df: pd.DataFrame, min_records: int = MIN_RECORDS) -> pd.DataFrame:
     """
     Executes the cleaning steps in a functional pipeline.
+    `min_records` is the expected final count (pass 0 for partial inputs).
     """
     initial_count = len(df)
     logger.info(f"Starting preprocessing on {initial_count} records...")
@@ -72,14 +174,19 @@ def process_pipeline(df: pd.DataFrame) -> pd.DataFrame:
     # Business Insight: Longer reviews often contain more specific complaints/praise
     df["word_count"] = df["cleaned_text"].apply(lambda x: len(x.split()))
 
-    # 5. Handling Missing Values
+    # 5. Language / Script Tagging
+    # Routes Amharic and transliterated reviews away from English-only models
+    df["language"] = detect_language(df["cleaned_text"])
+
+    # 6. Handling Missing Values
     # We drop rows where the review text is empty or date is invalid
     df = df.dropna(subset=["cleaned_text", "review_date"])
+    df = apply_review_dtypes(df)
 
     # Ensure we still meet the count requirement
-    if len(df) < 1200:
+    if len(df) < min_records:
         logger.warning(
-            f"Warning: Final count {len(df)} is below the 1200 target (400/bank)."
+            f"Warning: Final count {len(df)} is below the {min_records} target (400/bank)."
         )
 
     logger.info(f"Preprocessing complete. Final count: {len(df)} records.")
@@ -104,16 +211,19 @@ def save_processed_data(df: pd.DataFrame, output_dir: Path) -> None:
 
 def main():
     df = load_data(INPUT_DIR, RAW_FILE_NAME)
-
-    if df is not None:
-        clean_df = process_pipeline(df)
-        save_processed_data(clean_df, OUTPUT_DIR)
-
-        # Validation: Print a sample
-        print("\n--- Data Quality Check (Head) ---")
-        print(clean_df[["review_date", "bank_name", "cleaned_text"]].head())
-        print("\n--- Bank Distribution ---")
-        print(clean_df["bank_name"].value_counts())
+    if df is None:
+        sys.exit(1)
+
+    clean_df = process_pipeline(df)
+    save_processed_data(clean_df, OUTPUT_DIR)
+
+    # Validation: Print a sample
+    print("\n--- Data Quality Check (Head) ---")
+    print(clean_df[["review_date", "bank_name", "cleaned_text"]].head())
+    print("\n--- Bank Distribution ---")
+    print(clean_df["bank_name"].value_counts())
+    print("\n--- Language Distribution ---")
+    print(clean_df["language"].value_counts())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,212 @@
+import gzip
+import hashlib
+import io
+import json
+import sys
+import pandas as pd
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from utils import setup_logging
+from review_schema import CSV_DTYPES, apply_review_dtypes
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+ARCHIVE_DIR = Path("data/raw/archive")
+SEGMENT_MAX_RECORDS = 50_000
+STREAM_CHUNK_SIZE = 10_000
+
+
+class RawArchive:
+    """
+    Content-addressed store for raw scraped reviews.
+
+    - segments/seg_NNNNNN.jsonl.gz: append-only, gzip-compressed JSON lines,
+      each unique review stored once as {"h": <hash>, "r": {column: value}}
+    - manifests/<snapshot>.json: ordered list of hashes for one snapshot
+    - index.json.gz: hash -> segment number
+
+    A daily snapshot therefore only costs the reviews that were not seen
+    before plus one hash per row.
+    """
+
+    def __init__(self, archive_dir: Path = ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        self.segment_dir = archive_dir / "segments"
+        self.manifest_dir = archive_dir / "manifests"
+        self.index_path = archive_dir / "index.json.gz"
+        self.index: Dict[str, int] = {}
+        if self.index_path.exists():
+            with gzip.open(self.index_path, "rt", encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    # --- hashing ---
+
+    @staticmethod
+    def canonicalize(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Renders every value as the text it has in a CSV snapshot, so a
+        review hashes the same whether it comes from the scraper or from
+        an existing reviews_raw_*.csv file.
+        """
+        buffer = io.StringIO(df.to_csv(index=False))
+        return pd.read_csv(buffer, dtype=str, keep_default_na=False)
+
+    @staticmethod
+    def content_hash(record: Dict[str, str]) -> str:
+        payload = json.dumps(record, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    # --- writing ---
+
+    def _next_segment(self) -> int:
+        return max(self.index.values(), default=-1) + 1
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.segment_dir / f"seg_{segment:06d}.jsonl.gz"
+
+    def ingest(self, df: pd.DataFrame, snapshot: str) -> Path:
+        """
+        Archives one snapshot: new reviews are appended to fresh segments,
+        and the snapshot's manifest records every row's hash in order.
+        """
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+
+        canonical = self.canonicalize(df)
+        records = canonical.to_dict(orient="records")
+        hashes = [self.content_hash(record) for record in records]
+
+        new_records = {}
+        for digest, record in zip(hashes, records):
+            if digest not in self.index and digest not in new_records:
+                new_records[digest] = record
+
+        segment = self._next_segment()
+        pending = list(new_records.items())
+        for start in range(0, len(pending), SEGMENT_MAX_RECORDS):
+            batch = pending[start : start + SEGMENT_MAX_RECORDS]
+            with gzip.open(self._segment_path(segment), "wt", encoding="utf-8") as f:
+                for digest, record in batch:
+                    f.write(json.dumps({"h": digest, "r": record}, ensure_ascii=False))
+                    f.write("\n")
+            for digest, _ in batch:
+                self.index[digest] = segment
+            segment += 1
+
+        manifest_path = self.manifest_dir / f"{snapshot}.json"
+        with open(manifest_path, "w") as f:
+            json.dump(
+                {
+                    "snapshot": snapshot,
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "columns": list(canonical.columns),
+                    "hashes": hashes,
+                },
+                f,
+            )
+
+        tmp = self.index_path.with_suffix(".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        tmp.replace(self.index_path)
+
+        logger.info(
+            f"Archived snapshot '{snapshot}': {len(hashes)} rows, "
+            f"{len(new_records)} new, {len(hashes) - len(new_records)} deduplicated."
+        )
+        return manifest_path
+
+    # --- reading ---
+
+    def snapshots(self) -> List[str]:
+        return sorted(p.stem for p in self.manifest_dir.glob("*.json"))
+
+    def has_snapshot(self, snapshot: str) -> bool:
+        return (self.manifest_dir / f"{snapshot}.json").exists()
+
+    def _manifest(self, snapshot: str) -> dict:
+        with open(self.manifest_dir / f"{snapshot}.json", "r") as f:
+            return json.load(f)
+
+    def _iter_segment(self, segment: int) -> Iterator[dict]:
+        with gzip.open(self._segment_path(segment), "rt", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    @staticmethod
+    def _to_frame(records: List[Dict[str, str]], columns: List[str]) -> pd.DataFrame:
+        """Parses string records exactly as a raw CSV would be loaded."""
+        text = pd.DataFrame.from_records(records, columns=columns).to_csv(index=False)
+        df = pd.read_csv(io.StringIO(text), dtype=CSV_DTYPES)
+        return apply_review_dtypes(df)
+
+    def stream(
+        self, snapshot: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streams a snapshot as DataFrame chunks, one segment at a time.
+        Rows come out in segment order rather than manifest order.
+        """
+        manifest = self._manifest(snapshot)
+        needed = Counter(manifest["hashes"])
+        segments = sorted({self.index[digest] for digest in needed})
+
+        buffer: List[Dict[str, str]] = []
+        for segment in segments:
+            for entry in self._iter_segment(segment):
+                buffer.extend([entry["r"]] * needed.get(entry["h"], 0))
+                if len(buffer) >= chunk_size:
+                    yield self._to_frame(buffer, manifest["columns"])
+                    buffer = []
+        if buffer:
+            yield self._to_frame(buffer, manifest["columns"])
+
+    def reconstruct(self, snapshot: str) -> pd.DataFrame:
+        """Rebuilds a snapshot with its original row order."""
+        manifest = self._manifest(snapshot)
+        needed = set(manifest["hashes"])
+        segments = sorted({self.index[digest] for digest in needed})
+
+        records = {}
+        for segment in segments:
+            for entry in self._iter_segment(segment):
+                if entry["h"] in needed:
+                    records[entry["h"]] = entry["r"]
+
+        ordered = [records[digest] for digest in manifest["hashes"]]
+        return self._to_frame(ordered, manifest["columns"])
+
+
+def snapshot_name(file_path: Path) -> str:
+    """Snapshot name for a raw CSV, e.g. reviews_raw_2025-11-28."""
+    return Path(file_path).stem
+
+
+def main():
+    """
+    Usage:
+      raw_archive.py ingest <reviews_raw_*.csv> [...]
+      raw_archive.py list
+      raw_archive.py restore <snapshot> <output.csv>
+    """
+    archive = RawArchive()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+
+    if command == "ingest":
+        for path in map(Path, sys.argv[2:]):
+            df = pd.read_csv(path, dtype=str, keep_default_na=False)
+            archive.ingest(df, snapshot_name(path))
+    elif command == "restore" and len(sys.argv) == 4:
+        archive.reconstruct(sys.argv[2]).to_csv(sys.argv[3], index=False)
+        logger.info(f"Restored {sys.argv[2]} to {sys.argv[3]}")
+    else:
+        for snapshot in archive.snapshots():
+            print(snapshot)
+
+
+if __name__ == "__main__":
+    main()
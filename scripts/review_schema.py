@@ -0,0 +1,126 @@
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils import setup_logging
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+DEFAULT_FILE = Path("data/processed/sentiment_results.csv")
+
+# Low-cardinality columns are stored as categoricals, numeric columns are
+# downcast to the smallest type that fits the Play Store value ranges.
+REVIEW_DTYPES: Dict[str, str] = {
+    "source": "category",
+    "bank_name": "category",
+    "app_id": "category",
+    "app_version": "category",
+    "sentiment_label": "category",
+    "language": "category",
+    "rating": "int8",
+    "word_count": "int16",
+    "thumbs_up_count": "int32",
+    "sentiment_score": "float32",
+}
+
+# What the CSV parser is given: ratings are read as text so a blank or
+# malformed value does not abort the load; apply_review_dtypes drops those
+# rows and then casts to int8.
+CSV_DTYPES: Dict[str, str] = {**REVIEW_DTYPES, "rating": "str"}
+
+DATE_COLUMNS: List[str] = ["review_date"]
+VALID_RATINGS = (1, 5)
+
+
+def apply_review_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts any known review columns already present in the dataframe
+    to the compact schema. Columns that are missing are ignored. Rows
+    whose rating is missing or outside 1-5 are dropped (and counted).
+    """
+    if "rating" in df.columns and str(df["rating"].dtype) != REVIEW_DTYPES["rating"]:
+        ratings = pd.to_numeric(df["rating"], errors="coerce")
+        valid = ratings.between(*VALID_RATINGS)
+        if not valid.all():
+            logger.warning(
+                f"Dropped {int((~valid).sum())} reviews with a missing or invalid rating."
+            )
+            df = df[valid].copy()
+        df["rating"] = ratings[valid]
+
+    for column, dtype in REVIEW_DTYPES.items():
+        if column in df.columns and str(df[column].dtype) != dtype:
+            df[column] = df[column].astype(dtype)
+
+    for column in DATE_COLUMNS:
+        if column in df.columns and not pd.api.types.is_datetime64_any_dtype(
+            df[column]
+        ):
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+
+    return df
+
+
+def prefix_signature(
+    df: pd.DataFrame, watermark: Optional[pd.Timestamp]
+) -> Dict[str, object]:
+    """
+    Content signature of the rows at or before `watermark`: the columns,
+    the row count and an order-independent hash of those rows. Incremental
+    state built up to `watermark` is still valid for `df` exactly when the
+    signature is unchanged, however often the file itself is rewritten.
+    """
+    prefix = df.iloc[:0] if watermark is None else df[df["review_date"] <= watermark]
+    hashes = pd.util.hash_pandas_object(prefix, index=False).to_numpy()
+    return {
+        "columns": [str(c) for c in df.columns],
+        "rows": int(len(prefix)),
+        "hash": int(hashes.sum(dtype=np.uint64)),
+    }
+
+
+def load_reviews(file_path: Path, usecols: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Loads a review CSV (raw, clean or processed) with the compact schema.
+    The dtypes are applied by the CSV parser, so the wide object/int64
+    representation is never materialized. `review_date` is parsed here
+    once and downstream scripts can rely on it being datetime64.
+    """
+    logger.info(f"Loading reviews from {file_path}")
+    df = pd.read_csv(file_path, dtype=CSV_DTYPES, usecols=usecols)
+    return apply_review_dtypes(df)
+
+
+def memory_footprint_report(file_path: Path) -> pd.DataFrame:
+    """
+    Compares the per-column memory usage (deep, in bytes) of a plain
+    `pd.read_csv` load against the compact review schema.
+    """
+    baseline = pd.read_csv(file_path).memory_usage(deep=True, index=False)
+    compact = load_reviews(file_path).memory_usage(deep=True, index=False)
+
+    report = pd.DataFrame({"baseline_bytes": baseline, "compact_bytes": compact})
+    report.loc["TOTAL"] = report.sum()
+    report["reduction_pct"] = (
+        100 * (1 - report["compact_bytes"] / report["baseline_bytes"])
+    ).round(1)
+    return report
+
+
+def main():
+    file_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FILE
+    if not file_path.exists():
+        logger.error(f"Input file not found: {file_path}")
+        return
+
+    report = memory_footprint_report(file_path)
+
+    print("\n--- Memory Footprint (bytes) ---")
+    print(report.to_string())
+
+
+if __name__ == "__main__":
+    main()
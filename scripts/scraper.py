@@ -5,6 +5,7 @@ from typing import List, Dict, Any, Optional
 from google_play_scraper import Sort, reviews
 import os
 from utils import setup_logging
+from raw_archive import RawArchive
 
 # --- CONFIGURATION ---
 logger = setup_logging(__name__)
@@ -21,6 +22,10 @@ TARGET_COUNT = 500
 OUTPUT_DIR = Path("data/raw")
 DEFAULT_COUNTRY = "et"
 DEFAULT_LANG = "en"
+# Store snapshots in the deduplicated raw archive instead of full daily CSVs.
+# Off by default: preprocess.py reads the dated CSV and only falls back to
+# the archive when that file is missing.
+ARCHIVE_RAW = os.getenv("ARCHIVE_RAW", "0") == "1"
 
 
 def fetch_reviews(
@@ -82,16 +87,21 @@ def fetch_reviews(
         return []
 
 
-def save_dataset(data: List[Dict[str, Any]], output_dir: Path) -> Optional[Path]:
+def save_dataset(
+    data: List[Dict[str, Any]], output_dir: Path, archive: bool = ARCHIVE_RAW
+) -> Optional[Path]:
     """
-    Persists the aggregated data to a CSV file.
+    Persists the aggregated data as a daily snapshot.
 
     Args:
         data (List[Dict]): The list of review records.
         output_dir (Path): The directory path for output.
+        archive (bool): Store the snapshot in the content-addressed raw
+            archive (only unseen reviews are written) instead of a full CSV.
 
     Returns:
-        Optional[Path]: The path to the saved file, or None if save failed.
+        Optional[Path]: The path to the saved file (CSV or archive manifest),
+        or None if save failed.
     """
     if not data:
         logger.warning("No data to save. Skipping file generation.")
@@ -112,6 +122,14 @@ def save_dataset(data: List[Dict[str, Any]], output_dir: Path) -> Optional[Path]
         filename = f"reviews_raw_{timestamp}.csv"
         file_path = output_dir / filename
 
+        if archive:
+            manifest_path = RawArchive(output_dir / "archive").ingest(
+                df, file_path.stem
+            )
+            logger.info(f"Snapshot archived: {manifest_path}")
+            logger.info(f"Total Records: {len(df)}")
+            return manifest_path
+
         df.to_csv(file_path, index=False, encoding="utf-8")
 
         logger.info(f"Dataset successfully saved to: {file_path}")
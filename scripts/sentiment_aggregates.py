@@ -0,0 +1,279 @@
+import json
+import math
+import sys
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils import setup_logging
+from review_schema import load_reviews, prefix_signature
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+INPUT_FILE = Path("data/processed/sentiment_results.csv")
+STATE_FILE = Path("data/processed/sentiment_aggregates.json")
+
+# Window name -> pandas period frequency
+WINDOWS = {"daily": "D", "weekly": "W", "monthly": "M"}
+
+# Drop detection defaults: compare the latest period against the pooled
+# baseline of the preceding periods for the same bank and window.
+BASELINE_PERIODS = {"daily": 28, "weekly": 8, "monthly": 6}
+Z_THRESHOLD = 3.0
+MIN_PERIOD_COUNT = 5
+
+StateKey = Tuple[str, str, str]  # (window, bank_name, period_start)
+
+
+class SentimentAggregates:
+    """
+    Incremental count/sum/sum-of-squares state of `sentiment_score`
+    per (window, bank, period). Only new reviews are folded in, so an
+    update costs O(delta) regardless of how much history is stored.
+    """
+
+    def __init__(
+        self,
+        state: Optional[Dict[StateKey, List[float]]] = None,
+        watermark: Optional[pd.Timestamp] = None,
+        source: Optional[dict] = None,
+    ):
+        self.state = state if state is not None else {}
+        self.watermark = watermark
+        self.source = source  # prefix_signature of the rows folded so far
+
+    @classmethod
+    def load(cls, path: Path) -> "SentimentAggregates":
+        """Restores the aggregate state, or starts empty if none exists."""
+        if not path.exists():
+            logger.info(f"No aggregate state at {path}. Starting fresh.")
+            return cls()
+
+        with open(path, "r") as f:
+            payload = json.load(f)
+
+        state = {
+            (row["window"], row["bank_name"], row["period"]): [
+                row["count"],
+                row["sum"],
+                row["sumsq"],
+            ]
+            for row in payload["periods"]
+        }
+        watermark = payload.get("watermark")
+        return cls(
+            state, pd.Timestamp(watermark) if watermark else None, payload.get("source")
+        )
+
+    def save(self, path: Path) -> None:
+        """Persists the aggregate state and the ingestion watermark."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "source": self.source,
+            "periods": [
+                {
+                    "window": window,
+                    "bank_name": bank,
+                    "period": period,
+                    "count": count,
+                    "sum": total,
+                    "sumsq": sumsq,
+                }
+                for (window, bank, period), (count, total, sumsq) in sorted(
+                    self.state.items()
+                )
+            ],
+        }
+        with open(path, "w") as f:
+            json.dump(payload, f)
+        logger.info(f"Aggregate state saved to {path}")
+
+    def new_reviews(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the rows of `df` that arrived after the watermark. Rows
+        dated at or before it are assumed to be folded in already.
+        """
+        if self.watermark is None:
+            return df
+        return df[df["review_date"] > self.watermark]
+
+    def update(self, delta: pd.DataFrame) -> int:
+        """
+        Folds a batch of new reviews into every window.
+        The input frame is not modified. Returns the number of rows folded.
+        """
+        delta = delta.dropna(subset=["review_date", "sentiment_score"])
+        if delta.empty:
+            return 0
+
+        dates = delta["review_date"]
+        scores = delta["sentiment_score"].astype("float64")
+        banks = delta["bank_name"].astype(str)
+
+        for window, freq in WINDOWS.items():
+            periods = dates.dt.to_period(freq).dt.start_time.dt.strftime("%Y-%m-%d")
+            grouped = (
+                pd.DataFrame({"bank_name": banks, "period": periods, "score": scores})
+                .assign(sq=scores * scores)
+                .groupby(["bank_name", "period"])
+                .agg(count=("score", "size"), sum=("score", "sum"), sumsq=("sq", "sum"))
+            )
+            for (bank, period), row in grouped.iterrows():
+                acc = self.state.setdefault((window, bank, period), [0, 0.0, 0.0])
+                acc[0] += int(row["count"])
+                acc[1] += float(row["sum"])
+                acc[2] += float(row["sumsq"])
+
+        latest = dates.max()
+        if self.watermark is None or latest > self.watermark:
+            self.watermark = latest
+
+        return len(delta)
+
+    def frame(self, window: str = "monthly") -> pd.DataFrame:
+        """
+        Returns the stored periods of one window as a long dataframe with
+        `bank_name`, `period`, `count` and `mean` columns.
+        """
+        rows = [
+            {"bank_name": bank, "period": pd.Timestamp(period), "count": c, "sum": s}
+            for (w, bank, period), (c, s, _) in self.state.items()
+            if w == window
+        ]
+        if not rows:
+            return pd.DataFrame(columns=["bank_name", "period", "count", "mean"])
+
+        df = pd.DataFrame(rows).sort_values(["bank_name", "period"])
+        df["mean"] = df["sum"] / df["count"]
+        return df.drop(columns="sum").reset_index(drop=True)
+
+    def rolling_mean(
+        self, bank_name: str, window: str = "daily", periods: int = 7
+    ) -> pd.Series:
+        """
+        Count-weighted rolling mean over the last `periods` stored periods.
+        """
+        df = self.frame(window)
+        df = df[df["bank_name"] == bank_name].set_index("period")
+        df["sum"] = df["mean"] * df["count"]
+        rolled = df[["sum", "count"]].rolling(periods, min_periods=1).sum()
+        return (rolled["sum"] / rolled["count"]).rename("rolling_mean")
+
+    def detect_drops(
+        self,
+        window: str = "daily",
+        baseline_periods: Optional[int] = None,
+        z_threshold: float = Z_THRESHOLD,
+        min_count: int = MIN_PERIOD_COUNT,
+    ) -> pd.DataFrame:
+        """
+        Flags banks whose latest period mean is significantly below the
+        pooled mean of the preceding `baseline_periods` periods.
+        z = (latest_mean - baseline_mean) / (baseline_std / sqrt(latest_count))
+        """
+        if baseline_periods is None:
+            baseline_periods = BASELINE_PERIODS[window]
+
+        by_bank: Dict[str, List[Tuple[str, List[float]]]] = {}
+        for (w, bank, period), acc in self.state.items():
+            if w == window:
+                by_bank.setdefault(bank, []).append((period, acc))
+
+        alerts = []
+        for bank, entries in sorted(by_bank.items()):
+            entries.sort(key=lambda e: e[0])
+            latest_period, (n, total, _) = entries[-1]
+            baseline = entries[-1 - baseline_periods : -1]
+            if n < min_count or not baseline:
+                continue
+
+            base_n = sum(acc[0] for _, acc in baseline)
+            base_sum = sum(acc[1] for _, acc in baseline)
+            base_sumsq = sum(acc[2] for _, acc in baseline)
+            if base_n < 2:
+                continue
+
+            base_mean = base_sum / base_n
+            base_var = max(base_sumsq / base_n - base_mean**2, 0.0)
+            if base_var == 0.0:
+                continue
+
+            latest_mean = total / n
+            z = (latest_mean - base_mean) / math.sqrt(base_var / n)
+            alerts.append(
+                {
+                    "bank_name": bank,
+                    "window": window,
+                    "period": latest_period,
+                    "count": n,
+                    "mean": latest_mean,
+                    "baseline_mean": base_mean,
+                    "z_score": z,
+                    "drop": z <= -z_threshold,
+                }
+            )
+
+        return pd.DataFrame(alerts)
+
+
+def refresh(aggregates: SentimentAggregates, df: pd.DataFrame) -> SentimentAggregates:
+    """
+    Brings the state up to date with `df`. When the rows at or before the
+    watermark are unchanged (same prefix_signature), only newer rows are
+    folded in; a re-scored, corrected or reshaped input is rebuilt.
+    """
+    if aggregates.source != prefix_signature(df, aggregates.watermark):
+        if aggregates.state:
+            logger.info("Reviews before the watermark changed. Rebuilding.")
+        aggregates = SentimentAggregates()
+
+    folded = aggregates.update(aggregates.new_reviews(df))
+    aggregates.source = prefix_signature(df, aggregates.watermark)
+    logger.info(f"Folded {folded} new reviews (watermark: {aggregates.watermark})")
+
+    # The monthly counts must cover every scored review exactly once
+    stored = sum(
+        c for (w, _, _), (c, _, _) in aggregates.state.items() if w == "monthly"
+    )
+    expected = int(df.dropna(subset=["review_date", "sentiment_score"]).shape[0])
+    if stored != expected:
+        logger.warning(
+            f"Aggregates hold {stored} reviews but the input has {expected}. Rebuilding."
+        )
+        aggregates = SentimentAggregates()
+        aggregates.update(df)
+        aggregates.source = prefix_signature(df, aggregates.watermark)
+    return aggregates
+
+
+def main():
+    if not INPUT_FILE.exists():
+        logger.error(
+            f"Input file not found: {INPUT_FILE}. Run sentiment_analysis.py first."
+        )
+        sys.exit(1)
+
+    df = load_reviews(
+        INPUT_FILE, usecols=["bank_name", "review_date", "sentiment_score"]
+    )
+    aggregates = refresh(SentimentAggregates.load(STATE_FILE), df)
+    aggregates.save(STATE_FILE)
+
+    for window in WINDOWS:
+        alerts = aggregates.detect_drops(window)
+        if alerts.empty:
+            continue
+        print(f"\n--- {window.title()} Sentiment Check ---")
+        print(alerts.to_string(index=False))
+
+        for _, alert in alerts[alerts["drop"]].iterrows():
+            logger.warning(
+                f"Sentiment drop for {alert['bank_name']} ({window}, "
+                f"{alert['period']}): z={alert['z_score']:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
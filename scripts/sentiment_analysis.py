@@ -1,3 +1,8 @@
+import json
+import os
+import shutil
+import sys
+import time
 import pandas as pd
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
@@ -7,6 +12,8 @@ from nltk.stem import WordNetLemmatizer
 from pathlib import Path
 
 from utils import setup_logging
+from review_schema import apply_review_dtypes, load_reviews
+from lexicon_scorer import LexiconScorer, label_scores
 
 # --- CONFIGURATION ---
 logger = setup_logging(__name__)
@@ -14,6 +21,24 @@ logger = setup_logging(__name__)
 INPUT_FILE = Path("data/clean/reviews_clean.csv")
 OUTPUT_FILE = Path("data/processed/sentiment_results.csv")
 
+# Chunked, resumable execution: each finished chunk is written to the
+# checkpoint directory before the progress marker moves forward.
+CHECKPOINT_DIR = Path("data/processed/.checkpoints/sentiment")
+CHUNK_SIZE = 5000
+CHECKPOINT_COLUMNS = ["sentiment_score", "sentiment_label", "processed_text"]
+
+# Language routing (see preprocess.detect_language). VADER and the English
+# keyword pipeline only run on these tags; other rows are left unscored
+# instead of being counted as "Neutral".
+VADER_LANGUAGES = {"en", "mixed", "und"}
+KEYWORD_LANGUAGES = {"en", "mixed"}
+UNSCORED_LABEL = "Unscored"
+
+# "exact": per-review SentimentIntensityAnalyzer.polarity_scores
+# "fast": bulk sparse lexicon scorer (see lexicon_scorer.py for the
+# approximation and its agreement report)
+SENTIMENT_MODE = os.getenv("SENTIMENT_MODE", "exact").lower()
+
 # Ensure NLTK resources are available
 try:
     nltk.data.find("vader_lexicon")
@@ -33,18 +58,29 @@ def load_data(file_path: Path) -> pd.DataFrame:
     """Loads the cleaned dataset."""
     try:
         logger.info(f"Loading data from {file_path}")
-        return pd.read_csv(file_path)
+        return load_reviews(file_path)
     except Exception as e:
         logger.error(f"Failed to load data: {e}")
         raise
 
 
-def analyze_sentiment(df: pd.DataFrame) -> pd.DataFrame:
+def routed_to(df: pd.DataFrame, languages: set) -> pd.Series:
+    """
+    Boolean mask of rows whose 'language' tag is in `languages`.
+    Frames without a 'language' column are routed entirely.
+    """
+    if "language" not in df.columns:
+        return pd.Series(True, index=df.index)
+    return df["language"].isin(languages)
+
+
+def analyze_sentiment(df: pd.DataFrame, mode: str = SENTIMENT_MODE) -> pd.DataFrame:
     """
     Applies VADER sentiment analysis.
     Adds 'sentiment_score' and 'sentiment_label'.
+    Rows outside VADER_LANGUAGES get a NaN score and the 'Unscored' label.
     """
-    logger.info("Initializing VADER Sentiment Analyzer...")
+    logger.info(f"Initializing VADER Sentiment Analyzer ({mode} mode)...")
     sia = SentimentIntensityAnalyzer()
 
     def get_sentiment(text):
@@ -63,12 +99,25 @@ def analyze_sentiment(df: pd.DataFrame) -> pd.DataFrame:
         return score, label
 
     logger.info("Calculating sentiment scores...")
-    # Apply to the dataframe
-    df[["sentiment_score", "sentiment_label"]] = df["cleaned_text"].apply(
-        lambda x: pd.Series(get_sentiment(x))
-    )
+    routed = routed_to(df, VADER_LANGUAGES)
+    if (~routed).any():
+        logger.info(f"Skipping {int((~routed).sum())} non-English reviews.")
 
-    return df
+    # Apply to the routed rows of the dataframe
+    df["sentiment_score"] = float("nan")
+    df["sentiment_label"] = UNSCORED_LABEL
+    if mode == "fast":
+        scores = LexiconScorer(sia).score(df.loc[routed, "cleaned_text"])
+        df.loc[routed, "sentiment_score"] = scores
+        df.loc[routed, "sentiment_label"] = label_scores(scores)
+        return apply_review_dtypes(df)
+
+    scored = df.loc[routed, "cleaned_text"].apply(lambda x: pd.Series(get_sentiment(x)))
+    if not scored.empty:
+        df.loc[routed, "sentiment_score"] = scored[0].astype(float)
+        df.loc[routed, "sentiment_label"] = scored[1]
+
+    return apply_review_dtypes(df)
 
 
 def preprocess_for_keywords(
@@ -96,6 +145,7 @@ def preprocess_for_keywords(
 def prepare_keywords(df: pd.DataFrame) -> pd.DataFrame:
     """
     Adds a 'processed_text' column for keyword analysis.
+    Rows outside KEYWORD_LANGUAGES get an empty string.
     """
     logger.info(
         "Preprocessing text for keyword extraction (Tokenization, Stopwords, Lemmatization)..."
@@ -103,37 +153,133 @@ def prepare_keywords(df: pd.DataFrame) -> pd.DataFrame:
     stop_words = set(stopwords.words("english"))
     lemmatizer = WordNetLemmatizer()
 
-    df["processed_text"] = df["cleaned_text"].apply(
+    routed = routed_to(df, KEYWORD_LANGUAGES)
+    df["processed_text"] = ""
+    df.loc[routed, "processed_text"] = df.loc[routed, "cleaned_text"].apply(
         lambda x: preprocess_for_keywords(x, stop_words, lemmatizer)
     )
     return df
 
 
-def save_results(df: pd.DataFrame, output_path: Path) -> None:
-    """Saves the results to CSV."""
+def save_results(df: pd.DataFrame, output_path: Path) -> bool:
+    """Saves the results to CSV. Returns True on success."""
     try:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         df.to_csv(output_path, index=False)
         logger.info(f"Sentiment analysis results saved to {output_path}")
+        return True
     except Exception as e:
         logger.error(f"Failed to save results: {e}")
+        return False
+
+
+def _input_fingerprint(input_path: Path, chunk_size: int) -> dict:
+    """Identifies the run a checkpoint belongs to."""
+    stat = input_path.stat()
+    return {
+        "input": str(input_path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "chunk_size": chunk_size,
+        "mode": SENTIMENT_MODE,
+    }
+
+
+def _load_progress(checkpoint_dir: Path, fingerprint: dict) -> int:
+    """
+    Returns the number of completed chunks for this input, or 0.
+    Checkpoints left by a different input or chunk size are discarded.
+    """
+    marker = checkpoint_dir / "progress.json"
+    if marker.exists():
+        with open(marker, "r") as f:
+            progress = json.load(f)
+        if progress.get("fingerprint") == fingerprint:
+            return progress["completed_chunks"]
+        logger.info("Checkpoint belongs to a different input. Starting over.")
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    return 0
+
+
+def _save_progress(checkpoint_dir: Path, fingerprint: dict, completed: int) -> None:
+    """Atomically advances the progress marker."""
+    tmp = checkpoint_dir / "progress.json.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"fingerprint": fingerprint, "completed_chunks": completed}, f)
+    tmp.replace(checkpoint_dir / "progress.json")
+
+
+def run_checkpointed(
+    df: pd.DataFrame,
+    input_path: Path,
+    checkpoint_dir: Path = CHECKPOINT_DIR,
+    chunk_size: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Runs sentiment scoring and keyword preparation chunk by chunk.
+    Every completed chunk's output columns are staged on disk, so a
+    restarted run resumes after the last completed chunk. Scoring is
+    row-wise, so the result is identical to an uninterrupted run.
+    """
+    fingerprint = _input_fingerprint(input_path, chunk_size)
+    total_chunks = max((len(df) + chunk_size - 1) // chunk_size, 1)
+    completed = _load_progress(checkpoint_dir, fingerprint)
+    if completed:
+        logger.info(f"Resuming from chunk {completed + 1}/{total_chunks}.")
+
+    start = time.perf_counter()
+    rows_this_run = 0
+    for i in range(completed, total_chunks):
+        chunk = df.iloc[i * chunk_size : (i + 1) * chunk_size].copy()
+        chunk = prepare_keywords(analyze_sentiment(chunk))
+
+        tmp = checkpoint_dir / f"chunk_{i:06d}.csv.tmp"
+        chunk[CHECKPOINT_COLUMNS].to_csv(tmp, index=False)
+        tmp.replace(checkpoint_dir / f"chunk_{i:06d}.csv")
+        _save_progress(checkpoint_dir, fingerprint, i + 1)
+
+        # Progress / ETA from this run's chunk throughput
+        rows_this_run += len(chunk)
+        rate = rows_this_run / max(time.perf_counter() - start, 1e-9)
+        remaining = len(df) - min((i + 1) * chunk_size, len(df))
+        eta = time.strftime("%H:%M:%S", time.gmtime(remaining / rate))
+        logger.info(
+            f"Chunk {i + 1}/{total_chunks} ({100 * (i + 1) / total_chunks:.1f}%) - "
+            f"{rate:.0f} rows/s - ETA {eta}"
+        )
+
+    staged = pd.concat(
+        [
+            pd.read_csv(
+                checkpoint_dir / f"chunk_{i:06d}.csv",
+                keep_default_na=False,
+                na_values={"sentiment_score": [""]},
+            )
+            for i in range(total_chunks)
+        ],
+        ignore_index=True,
+    )
+    for column in CHECKPOINT_COLUMNS:
+        df[column] = staged[column].to_numpy()
+    return apply_review_dtypes(df)
 
 
 def main():
     if not INPUT_FILE.exists():
         logger.error(f"Input file not found: {INPUT_FILE}")
-        return
+        sys.exit(1)
 
     df = load_data(INPUT_FILE)
 
-    # 1. Sentiment Analysis
-    df = analyze_sentiment(df)
-
-    # 2. Prepare for Keyword/Thematic Analysis
-    df = prepare_keywords(df)
+    # 1. Sentiment Analysis + 2. Prepare for Keyword/Thematic Analysis
+    # (chunked with durable checkpoints; resumes after a crash)
+    df = run_checkpointed(df, INPUT_FILE)
 
     # Save
-    save_results(df, OUTPUT_FILE)
+    if save_results(df, OUTPUT_FILE):
+        # The checkpoints are only needed until the final artifact exists
+        shutil.rmtree(CHECKPOINT_DIR, ignore_errors=True)
 
     # Validation
     print("\n--- Sentiment Distribution ---")
@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from utils import setup_logging
+from review_schema import apply_review_dtypes
+import preprocess
+import sentiment_analysis
+from keyword_thematic import KEYWORD_FILE, extract_themes, save_themes
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+SHARD_COLUMN = "bank_name"
+MAX_WORKERS = int(os.getenv("PIPELINE_WORKERS", "0")) or None  # None -> one per shard
+
+
+def process_shard(bank: str, shard: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Runs preprocessing, sentiment scoring and keyword extraction for one
+    bank. Executed in a worker process; returns outputs plus stage timings.
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    clean = preprocess.process_pipeline(shard, min_records=0)
+    timings["preprocess"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = sentiment_analysis.analyze_sentiment(clean.copy())
+    results = sentiment_analysis.prepare_keywords(results)
+    timings["sentiment"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    themes = extract_themes(results, bank)
+    timings["keywords"] = time.perf_counter() - start
+
+    return {
+        "bank": bank,
+        "clean": clean,
+        "results": results,
+        "themes": themes,
+        "timings": timings,
+        "rows": len(results),
+    }
+
+
+def partition(df: pd.DataFrame) -> List[Tuple[str, pd.DataFrame]]:
+    """
+    Splits the raw data into per-bank shards. Duplicates are dropped
+    globally first so that sharding cannot change which rows survive.
+    """
+    df = df.drop_duplicates(subset=["user_name", "review_date", "review_text"])
+    banks = sorted(df[SHARD_COLUMN].astype(str).unique())
+    return [(bank, df[df[SHARD_COLUMN].astype(str) == bank]) for bank in banks]
+
+
+def merge(outputs: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, ...]:
+    """
+    Deterministically merges shard outputs. Rows are restored to their
+    original input order (the raw index survives every stage), so the
+    merged artifacts match a single-process run regardless of which
+    shard finished first.
+    """
+    outputs = sorted(outputs, key=lambda o: o["bank"])
+    clean = apply_review_dtypes(pd.concat([o["clean"] for o in outputs]).sort_index())
+    results = apply_review_dtypes(
+        pd.concat([o["results"] for o in outputs]).sort_index()
+    )
+    themes = pd.concat([o["themes"] for o in outputs], ignore_index=True)
+    return clean, results, themes
+
+
+def run_sharded(df: pd.DataFrame, max_workers=MAX_WORKERS) -> Tuple[pd.DataFrame, ...]:
+    """Runs every shard in its own worker process and merges the outputs."""
+    shards = partition(df)
+    workers = max_workers or len(shards)
+    logger.info(f"Running {len(shards)} shard(s) on {workers} worker(s)...")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(process_shard, bank, shard) for bank, shard in shards]
+        outputs = [future.result() for future in futures]
+    wall = time.perf_counter() - start
+
+    timing_rows = [
+        {"bank_name": o["bank"], "rows": o["rows"], **o["timings"]} for o in outputs
+    ]
+    timings = pd.DataFrame(timing_rows).set_index("bank_name").sort_index()
+    timings["total"] = timings[["preprocess", "sentiment", "keywords"]].sum(axis=1)
+
+    print("\n--- Per-Shard Timings (s) ---")
+    print(timings.round(3).to_string())
+    print(
+        f"Wall clock: {wall:.2f}s | Critical path (slowest shard): "
+        f"{timings['total'].max():.2f}s | Serial sum: {timings['total'].sum():.2f}s"
+    )
+
+    return merge(outputs)
+
+
+def main():
+    df = preprocess.load_data(preprocess.INPUT_DIR, preprocess.RAW_FILE_NAME)
+    if df is None:
+        sys.exit(1)
+
+    clean, results, themes = run_sharded(df)
+
+    if len(clean) < preprocess.MIN_RECORDS:
+        logger.warning(
+            f"Warning: Final count {len(clean)} is below the "
+            f"{preprocess.MIN_RECORDS} target (400/bank)."
+        )
+
+    preprocess.save_processed_data(clean, preprocess.OUTPUT_DIR)
+    sentiment_analysis.save_results(results, sentiment_analysis.OUTPUT_FILE)
+
+    save_themes(themes, KEYWORD_FILE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+import json
+import sys
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from pathlib import Path
+from sklearn.feature_extraction.text import CountVectorizer
+from typing import Dict, List, Optional, Tuple
+
+from utils import setup_logging
+from review_schema import load_reviews, prefix_signature
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+INPUT_FILE = Path("data/processed/sentiment_results.csv")
+CUBE_DIR = Path("data/processed/term_cube")
+
+NGRAM_RANGE = (1, 2)
+SMOOTHING = 0.5  # additive prior on every count in the significance score
+
+RECENT_DAYS = 7
+BASELINE_DAYS = 28
+
+DAY_ZERO = pd.Timestamp("1970-01-01")
+
+
+class TermCube:
+    """
+    Sparse (bank, sentiment, day) x term count cube for unigrams and bigrams.
+    Each row is one (bank, sentiment, day) cell; new reviews are vectorized
+    on their own and added into the matching cells, so an update only
+    touches the delta.
+    """
+
+    def __init__(self):
+        self.terms: List[str] = []
+        self.term_ids: Dict[str, int] = {}
+        self.cells: List[Tuple[str, str, int]] = []
+        self.cell_ids: Dict[Tuple[str, str, int], int] = {}
+        self.counts = sp.csr_matrix((0, 0), dtype=np.int32)
+        self.watermark: Optional[pd.Timestamp] = None
+        self.source: Optional[dict] = None  # prefix_signature of folded rows
+        self._cell_arrays: Optional[Tuple[np.ndarray, ...]] = None
+        self._term_lengths: Optional[np.ndarray] = None
+
+    # --- incremental updates ---
+
+    def _term_id(self, term: str) -> int:
+        if term not in self.term_ids:
+            self.term_ids[term] = len(self.terms)
+            self.terms.append(term)
+        return self.term_ids[term]
+
+    def _cell_id(self, cell: Tuple[str, str, int]) -> int:
+        if cell not in self.cell_ids:
+            self.cell_ids[cell] = len(self.cells)
+            self.cells.append(cell)
+            self._cell_arrays = None
+        return self.cell_ids[cell]
+
+    def new_reviews(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Returns the rows of `df` that arrived after the watermark."""
+        if self.watermark is None:
+            return df
+        return df[df["review_date"] > self.watermark]
+
+    def update(self, delta: pd.DataFrame) -> int:
+        """Folds a batch of new reviews into the cube. Returns rows folded."""
+        delta = delta.dropna(subset=["processed_text", "review_date"])
+        delta = delta[delta["processed_text"].str.len() > 0]
+        if delta.empty:
+            return 0
+
+        vec = CountVectorizer(ngram_range=NGRAM_RANGE, stop_words="english")
+        try:
+            doc_terms = vec.fit_transform(delta["processed_text"])
+        except ValueError:  # only stop words in this batch
+            return 0
+
+        # Local vocabulary / cell ids -> global ids
+        local_terms = vec.get_feature_names_out()
+        term_map = np.array([self._term_id(t) for t in local_terms])
+
+        days = ((delta["review_date"].dt.normalize() - DAY_ZERO).dt.days).to_numpy()
+        keys = zip(
+            delta["bank_name"].astype(str),
+            delta["sentiment_label"].astype(str),
+            days.tolist(),
+        )
+        row_map = np.array([self._cell_id(key) for key in keys])
+
+        # Sum review rows into their cells with one sparse product
+        shape = (len(self.cells), len(self.terms))
+        to_cells = sp.csr_matrix(
+            (np.ones(len(row_map), dtype=np.int32), (row_map, np.arange(len(row_map)))),
+            shape=(shape[0], len(row_map)),
+        )
+        cell_terms = (to_cells @ doc_terms.astype(np.int32)).tocoo()
+        delta_counts = sp.csr_matrix(
+            (cell_terms.data, (cell_terms.row, term_map[cell_terms.col])),
+            shape=shape,
+            dtype=np.int32,
+        )
+
+        self.counts.resize(shape)
+        self.counts = (self.counts + delta_counts).tocsr()
+
+        latest = delta["review_date"].max()
+        if self.watermark is None or latest > self.watermark:
+            self.watermark = latest
+        return len(delta)
+
+    # --- queries ---
+
+    def _window_counts(
+        self,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        bank_name: Optional[str],
+        sentiment: Optional[str],
+    ) -> np.ndarray:
+        """Summed term counts over cells in [start, end) matching the filters."""
+        if self._cell_arrays is None:
+            banks, labels, days = zip(*self.cells)
+            self._cell_arrays = (np.array(banks), np.array(labels), np.array(days))
+        banks, labels, days = self._cell_arrays
+
+        mask = (days >= (start - DAY_ZERO).days) & (days < (end - DAY_ZERO).days)
+        if bank_name is not None:
+            mask &= banks == bank_name
+        if sentiment is not None:
+            mask &= labels == sentiment
+        return np.asarray(self.counts[np.flatnonzero(mask)].sum(axis=0)).ravel()
+
+    def movers(
+        self,
+        baseline: Tuple[pd.Timestamp, pd.Timestamp],
+        recent: Tuple[pd.Timestamp, pd.Timestamp],
+        bank_name: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        ngram: Optional[int] = None,
+        direction: str = "rising",
+        top_k: int = 10,
+    ) -> pd.DataFrame:
+        """
+        Top rising (or falling) terms between a baseline and a recent
+        window, each given as [start, end). The score is the z-statistic
+        of the smoothed log rate ratio:
+            z = log(rate_recent / rate_baseline) / sqrt(1/a + 1/b)
+        where a, b are the smoothed term counts in each window. Rising
+        keeps only z > 0 and falling only z < 0, so fewer than `top_k`
+        rows come back when fewer terms moved that way.
+        """
+        if direction not in ("rising", "falling"):
+            raise ValueError(
+                f"direction must be 'rising' or 'falling', not {direction!r}"
+            )
+        if not self.terms or not self.cells:
+            return pd.DataFrame(columns=["term", "baseline", "recent", "z_score"])
+
+        base = self._window_counts(*baseline, bank_name, sentiment)
+        rec = self._window_counts(*recent, bank_name, sentiment)
+
+        a = rec + SMOOTHING
+        b = base + SMOOTHING
+        vocab = len(self.terms)
+        log_ratio = np.log(a / (rec.sum() + SMOOTHING * vocab)) - np.log(
+            b / (base.sum() + SMOOTHING * vocab)
+        )
+        z = log_ratio / np.sqrt(1 / a + 1 / b)
+
+        # Only terms that actually moved in the requested direction
+        rising = direction == "rising"
+        candidates = ((rec + base) > 0) & ((z > 0) if rising else (z < 0))
+        if ngram is not None:
+            if self._term_lengths is None or len(self._term_lengths) != vocab:
+                self._term_lengths = np.array([t.count(" ") + 1 for t in self.terms])
+            candidates &= self._term_lengths == ngram
+
+        ids = np.flatnonzero(candidates)
+        order = ids[np.argsort(-z[ids] if rising else z[ids])][:top_k]
+        return pd.DataFrame(
+            {
+                "term": [self.terms[i] for i in order],
+                "baseline": base[order],
+                "recent": rec[order],
+                "z_score": z[order].round(3),
+            }
+        )
+
+    # --- persistence ---
+
+    def save(self, cube_dir: Path) -> None:
+        """Persists the counts (compressed .npz) and the term/cell index."""
+        cube_dir.mkdir(parents=True, exist_ok=True)
+        sp.save_npz(cube_dir / "counts.npz", self.counts, compressed=True)
+        with open(cube_dir / "index.json", "w") as f:
+            json.dump(
+                {
+                    "watermark": self.watermark.isoformat() if self.watermark else None,
+                    "source": self.source,
+                    "terms": self.terms,
+                    "cells": self.cells,
+                },
+                f,
+            )
+        logger.info(f"Term cube saved to {cube_dir} ({self.counts.nnz} non-zeros)")
+
+    @classmethod
+    def load(cls, cube_dir: Path) -> "TermCube":
+        """Restores a cube, or starts empty if none exists."""
+        cube = cls()
+        if not (cube_dir / "index.json").exists():
+            logger.info(f"No term cube at {cube_dir}. Starting fresh.")
+            return cube
+
+        with open(cube_dir / "index.json", "r") as f:
+            index = json.load(f)
+        for term in index["terms"]:
+            cube._term_id(term)
+        for bank, label, day in index["cells"]:
+            cube._cell_id((bank, label, int(day)))
+        cube.counts = sp.load_npz(cube_dir / "counts.npz").tocsr()
+        if index["watermark"]:
+            cube.watermark = pd.Timestamp(index["watermark"])
+        cube.source = index.get("source")
+        return cube
+
+
+def refresh(cube: TermCube, df: pd.DataFrame) -> TermCube:
+    """
+    Brings the cube up to date with `df`. As with the sentiment aggregates,
+    only rows newer than the watermark are folded in while the rows at or
+    before it are unchanged (same prefix_signature); otherwise the cube is
+    rebuilt.
+    """
+    if cube.source != prefix_signature(df, cube.watermark):
+        if cube.cells:
+            logger.info("Reviews before the watermark changed. Rebuilding the cube.")
+        cube = TermCube()
+
+    folded = cube.update(cube.new_reviews(df))
+    cube.source = prefix_signature(df, cube.watermark)
+    logger.info(f"Folded {folded} new reviews into the term cube.")
+    return cube
+
+
+def main():
+    if not INPUT_FILE.exists():
+        logger.error(
+            f"Input file not found: {INPUT_FILE}. Run sentiment_analysis.py first."
+        )
+        sys.exit(1)
+
+    df = load_reviews(
+        INPUT_FILE,
+        usecols=["bank_name", "review_date", "sentiment_label", "processed_text"],
+    )
+    cube = refresh(TermCube.load(CUBE_DIR), df)
+    cube.save(CUBE_DIR)
+
+    if cube.watermark is None:
+        return
+
+    end = cube.watermark.normalize() + pd.Timedelta(days=1)
+    recent = (end - pd.Timedelta(days=RECENT_DAYS), end)
+    baseline = (recent[0] - pd.Timedelta(days=BASELINE_DAYS), recent[0])
+
+    for bank in sorted({cell[0] for cell in cube.cells}):
+        start = time.perf_counter()
+        rising = cube.movers(baseline, recent, bank_name=bank, sentiment="Negative")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"\n=== Rising Negative Terms for {bank} "
+            f"(last {RECENT_DAYS}d vs prior {BASELINE_DAYS}d, {elapsed_ms:.1f} ms) ==="
+        )
+        print(rising.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import re
+import sys
+import pandas as pd
+from pathlib import Path
+from typing import Tuple
+
+from utils import setup_logging
+from review_schema import load_reviews
+from keyword_thematic import get_top_n_grams
+
+# --- CONFIGURATION ---
+logger = setup_logging(__name__)
+
+INPUT_FILE = Path("data/processed/sentiment_results.csv")
+OUTPUT_FILE = Path("data/processed/version_cohorts.csv")
+
+TOP_NEGATIVE_BIGRAMS = 5
+RATINGS = range(1, 6)
+UNKNOWN_VERSION = "unknown"
+
+
+def version_key(version: str) -> Tuple:
+    """
+    Natural sort key for app versions so that 5.10.0 sorts after 5.9.2.
+    Non-numeric parts are compared as strings after the numeric ones.
+    """
+    parts = re.split(r"[.\-_]", str(version))
+    return tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in parts)
+
+
+def _format_bigrams(corpus) -> str:
+    """Serializes the top negative bigrams as 'phrase:count|phrase:count'."""
+    top = get_top_n_grams(corpus, n=2, top_k=TOP_NEGATIVE_BIGRAMS)
+    return "|".join(f"{phrase}:{int(freq)}" for phrase, freq in top)
+
+
+def build_cohort_index(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Builds the per-bank, per-app-version cohort index:
+    review count, rating histogram, mean rating, mean sentiment and the
+    top negative bigrams of each cohort. Reviews without a version are
+    grouped under 'unknown'.
+    """
+    versions = (
+        df["app_version"].astype(str).where(df["app_version"].notna(), UNKNOWN_VERSION)
+    )
+    cohorts = df.assign(app_version=versions, bank_name=df["bank_name"].astype(str))
+    grouped = cohorts.groupby(["bank_name", "app_version"])
+
+    index = grouped.agg(
+        review_count=("rating", "size"),
+        mean_rating=("rating", "mean"),
+        mean_sentiment=("sentiment_score", "mean"),
+    )
+
+    histogram = (
+        pd.crosstab([cohorts["bank_name"], cohorts["app_version"]], cohorts["rating"])
+        .reindex(columns=list(RATINGS), fill_value=0)
+        .add_prefix("rating_")
+    )
+    index = index.join(histogram)
+
+    negative = cohorts[cohorts["sentiment_label"] == "Negative"]
+    index["top_negative_bigrams"] = (
+        negative.groupby(["bank_name", "app_version"])["processed_text"]
+        .apply(lambda texts: _format_bigrams(texts.dropna().tolist()))
+        .reindex(index.index)
+        .fillna("")
+    )
+
+    index = index.reset_index()
+    index["_order"] = index["app_version"].map(version_key)
+    return (
+        index.sort_values(["bank_name", "_order"])
+        .drop(columns="_order")
+        .reset_index(drop=True)
+    )
+
+
+def save_cohort_index(index: pd.DataFrame, output_path: Path) -> None:
+    """Saves the cohort index to CSV."""
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        index.to_csv(output_path, index=False)
+        logger.info(f"Version cohort index saved to {output_path}")
+    except IOError as e:
+        logger.error(f"Failed to save cohort index: {e}")
+
+
+def load_cohort_index(file_path: Path = OUTPUT_FILE) -> pd.DataFrame:
+    """Loads a stored cohort index with versions kept as strings."""
+    return pd.read_csv(
+        file_path,
+        dtype={"bank_name": "category", "app_version": str},
+        keep_default_na=False,
+    )
+
+
+def compare_versions(
+    index: pd.DataFrame, bank_name: str, version_a: str, version_b: str
+) -> pd.DataFrame:
+    """
+    Looks up two cohorts of one bank side by side, with a 'delta' column
+    (version_a - version_b) for the numeric metrics.
+    """
+    if version_a == version_b:
+        raise ValueError(f"Cannot compare version {version_a} with itself")
+
+    bank_index = index[index["bank_name"] == bank_name].set_index("app_version")
+    missing = [v for v in (version_a, version_b) if v not in bank_index.index]
+    if missing:
+        raise KeyError(f"No cohort for {bank_name} version(s): {missing}")
+
+    comparison = bank_index.loc[[version_a, version_b]].drop(columns="bank_name").T
+    numeric = comparison.apply(pd.to_numeric, errors="coerce")
+    comparison["delta"] = numeric[version_a] - numeric[version_b]
+    return comparison
+
+
+def main():
+    # Lookup mode: version_cohorts.py <bank> <version_a> <version_b>
+    if len(sys.argv) == 4:
+        if not OUTPUT_FILE.exists():
+            logger.error(
+                f"Cohort index not found: {OUTPUT_FILE}. Run version_cohorts.py "
+                "without arguments first."
+            )
+            sys.exit(1)
+        _, bank, version_a, version_b = sys.argv
+        try:
+            print(compare_versions(load_cohort_index(), bank, version_a, version_b))
+        except (KeyError, ValueError) as e:
+            logger.error(e.args[0])
+            sys.exit(1)
+        return
+
+    if not INPUT_FILE.exists():
+        logger.error(
+            f"Input file not found: {INPUT_FILE}. Run sentiment_analysis.py first."
+        )
+        sys.exit(1)
+
+    df = load_reviews(INPUT_FILE)
+    index = build_cohort_index(df)
+    save_cohort_index(index, OUTPUT_FILE)
+
+    print("\n--- Largest Cohorts per Bank ---")
+    print(
+        index.sort_values("review_count", ascending=False)
+        .groupby("bank_name")
+        .head(3)[["bank_name", "app_version", "review_count", "mean_sentiment"]]
+        .to_string(index=False)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
-import pandas as pd
+import sys
 import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
 from pathlib import Path
 
 from utils import setup_logging
+from review_schema import load_reviews
 
 # --- CONFIGURATION ---
 logger = setup_logging(__name__)
@@ -20,7 +21,7 @@ def load_data():
     if not INPUT_FILE.exists():
         logger.error(f"Input file not found: {INPUT_FILE}")
         return None
-    return pd.read_csv(INPUT_FILE)
+    return load_reviews(INPUT_FILE)
 
 
 def plot_rating_distribution(df):
@@ -37,11 +38,12 @@ def plot_rating_distribution(df):
 
 def plot_sentiment_trend(df):
     logger.info("Generating Sentiment Trend Plot...")
-    df["review_date"] = pd.to_datetime(df["review_date"])
-    df["month_year"] = df["review_date"].dt.to_period("M")
+    month_year = df["review_date"].dt.to_period("M").rename("month_year")
 
     trend_df = (
-        df.groupby(["month_year", "bank_name"])["sentiment_score"].mean().reset_index()
+        df.groupby([month_year, "bank_name"], observed=True)["sentiment_score"]
+        .mean()
+        .reset_index()
     )
     trend_df["month_year"] = trend_df["month_year"].astype(str)
 
@@ -80,11 +82,13 @@ def generate_wordclouds(df):
 
 def main():
     df = load_data()
-    if df is not None:
-        plot_rating_distribution(df)
-        plot_sentiment_trend(df)
-        generate_wordclouds(df)
-        logger.info(f"Visualizations saved to {REPORT_DIR}")
+    if df is None:
+        sys.exit(1)
+
+    plot_rating_distribution(df)
+    plot_sentiment_trend(df)
+    generate_wordclouds(df)
+    logger.info(f"Visualizations saved to {REPORT_DIR}")
 
 
 if __name__ == "__main__":